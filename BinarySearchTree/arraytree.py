@@ -0,0 +1,242 @@
+from array import array
+
+class ArrayTree():
+    """
+    AVL tree stored in parallel arrays instead of one Python object per node.
+
+    Node `i` consists of `_keys[i]`, `_values[i]`, the child indices `_left[i]`/`_right[i]`,
+    its height and the number of keys in its subtree. Index 0 is the shared leaf
+    (height 0, size 0), thus children never need to be checked for existence.
+    Slots of deleted keys are recycled.
+
+    As in `tree.Node`, larger keys are stored on the left, smaller keys on the right.
+    The interface is that of a dictionary: `t[key] = value`, `t[key]`, `del t[key]`, `key in t`.
+    """
+
+    def __init__(self):
+        self._keys = [None]
+        self._values = [None]
+        self._left = array('q', [0])
+        self._right = array('q', [0])
+        self._height = array('q', [0])
+        self._size = array('q', [0])
+        self._free = []
+        self._root = 0
+
+    @classmethod
+    def from_sorted(cls, items):
+        """
+        Bulk-loads a perfectly balanced tree in O(n).
+
+        Input:
+        items: iterable
+            (key, value) pairs in strictly ascending key order
+        """
+        t = cls()
+        items = list(items)
+        assert all(a[0] < b[0] for a, b in zip(items, items[1:])), 'Keys need to be unique and in ascending order.'
+        n = len(items)
+        # position of sorted item j in the arrays is j + 1
+        t._keys.extend(k for k, _ in items)
+        t._values.extend(v for _, v in items)
+        t._left.extend(array('q', bytes(8 * n)))
+        t._right.extend(array('q', bytes(8 * n)))
+        t._height.extend(array('q', bytes(8 * n)))
+        t._size.extend(array('q', bytes(8 * n)))
+
+        # builds bottom-up over ranges [lo, hi), without recursion
+        stack = [(0, n, None, False)] if n else []
+        order = []
+        while stack:
+            lo, hi, parent, is_left = stack.pop()
+            mid = (lo + hi) // 2
+            i = mid + 1
+            if parent is None:
+                t._root = i
+            elif is_left:
+                t._left[parent] = i
+            else:
+                t._right[parent] = i
+            order.append(i)
+            if lo < mid:
+                stack.append((lo, mid, i, False)) # smaller keys
+            if mid + 1 < hi:
+                stack.append((mid + 1, hi, i, True)) # larger keys
+        for i in reversed(order): # children before parents
+            t._refresh(i)
+        return t
+
+    def _alloc(self, key, value):
+        if self._free:
+            i = self._free.pop()
+            self._keys[i] = key
+            self._values[i] = value
+            self._left[i] = self._right[i] = 0
+            self._height[i] = self._size[i] = 1
+            return i
+        self._keys.append(key)
+        self._values.append(value)
+        self._left.append(0)
+        self._right.append(0)
+        self._height.append(1)
+        self._size.append(1)
+        return len(self._keys) - 1
+
+    def _release(self, i):
+        self._keys[i] = None
+        self._values[i] = None
+        self._free.append(i)
+
+    def _refresh(self, i):
+        l, r = self._left[i], self._right[i]
+        self._height[i] = 1 + max(self._height[l], self._height[r])
+        self._size[i] = 1 + self._size[l] + self._size[r]
+
+    def _rotate_right(self, i):
+        # lifts the left child to the top of this subtree; returns the new subtree root
+        p = self._left[i]
+        self._left[i] = self._right[p]
+        self._right[p] = i
+        self._refresh(i)
+        self._refresh(p)
+        return p
+
+    def _rotate_left(self, i):
+        # lifts the right child to the top of this subtree; returns the new subtree root
+        p = self._right[i]
+        self._right[i] = self._left[p]
+        self._left[p] = i
+        self._refresh(i)
+        self._refresh(p)
+        return p
+
+    def _rebalance(self, i):
+        H, L, R = self._height, self._left, self._right
+        balance = H[L[i]] - H[R[i]]
+        if balance > 1:
+            if H[L[L[i]]] < H[R[L[i]]]:
+                L[i] = self._rotate_left(L[i])
+            return self._rotate_right(i)
+        if balance < -1:
+            if H[R[R[i]]] < H[L[R[i]]]:
+                R[i] = self._rotate_right(R[i])
+            return self._rotate_left(i)
+        self._refresh(i)
+        return i
+
+    def _rebalance_path(self, path):
+        # rebalances bottom-up along `path` (root first) and re-links rotated subtrees
+        for d in range(len(path) - 1, -1, -1):
+            i = path[d]
+            j = self._rebalance(i)
+            if j == i:
+                continue
+            if d == 0:
+                self._root = j
+            elif self._left[path[d - 1]] == i:
+                self._left[path[d - 1]] = j
+            else:
+                self._right[path[d - 1]] = j
+
+    def _find(self, key):
+        i = self._root
+        while i:
+            k = self._keys[i]
+            if k == key: return i
+            i = self._left[i] if k < key else self._right[i]
+        return 0
+
+    def __contains__(self, key):
+        return self._find(key) != 0
+
+    def __getitem__(self, key):
+        i = self._find(key)
+        if not i:
+            raise ValueError(f'Element "{key}" not in Datastructure.')
+        return self._values[i]
+
+    def __setitem__(self, key, value):
+        path = []
+        i = self._root
+        while i:
+            k = self._keys[i]
+            if k == key: self._values[i] = value; return
+            path.append(i)
+            i = self._left[i] if k < key else self._right[i]
+
+        j = self._alloc(key, value)
+        if not path:
+            self._root = j
+            return
+        p = path[-1]
+        if self._keys[p] < key:
+            self._left[p] = j
+        else:
+            self._right[p] = j
+        self._rebalance_path(path)
+
+    def __delitem__(self, key):
+        path = []
+        i = self._root
+        while i and self._keys[i] != key:
+            path.append(i)
+            i = self._left[i] if self._keys[i] < key else self._right[i]
+        if not i:
+            raise ValueError(f'Element "{key}" not in Datastructure.')
+
+        if self._left[i] and self._right[i]:
+            # successor: smallest key within the larger (left) subtree
+            path.append(i)
+            s = self._left[i]
+            while self._right[s]:
+                path.append(s)
+                s = self._right[s]
+            self._keys[i], self._values[i] = self._keys[s], self._values[s]
+            i = s
+
+        child = self._left[i] or self._right[i]
+        if not path:
+            self._root = child
+        elif self._left[path[-1]] == i:
+            self._left[path[-1]] = child
+        else:
+            self._right[path[-1]] = child
+        self._release(i)
+        self._rebalance_path(path)
+
+    def __len__(self):
+        return self._size[self._root]
+
+    def _inorder(self):
+        # node indices in ascending key order
+        stack = []
+        i = self._root
+        while stack or i:
+            while i:
+                stack.append(i)
+                i = self._right[i]
+            i = stack.pop()
+            yield i
+            i = self._left[i]
+
+    def keys(self):
+        for i in self._inorder():
+            yield self._keys[i]
+
+    def values(self):
+        for i in self._inorder():
+            yield self._values[i]
+
+    def items(self):
+        for i in self._inorder():
+            yield self._keys[i], self._values[i]
+
+    def __str__(self):
+        return '{' + ', '.join(f'{k}: {v}' for k, v in self.items()) + '}'
+
+if __name__ == '__main__':
+    T = ArrayTree()
+    for k in 'bcdenmlo':
+        T[k] = ord(k)
+    del T['d']
+    print(T, len(T))
@@ -0,0 +1,61 @@
+import random
+import sys
+import time
+from tree import Node, AVLNode
+from blocktree import BlockTree
+
+def _dict_irange(d, lo, hi):
+    # a dict has no order, thus a range query needs a full scan
+    return ((k, v) for k, v in d.items() if lo <= k <= hi)
+
+def bench(cls, keys, ranges):
+    """
+    Times the workloads insert, lookup, iteration and range-scan on a fresh instance of `cls`.
+
+    Input:
+    keys: list
+        keys to insert (in this order) and to look up (shuffled)
+    ranges: list
+        (lo, hi) bounds of the range scans
+    """
+    res = {}
+    t = cls()
+    start = time.perf_counter()
+    for k in keys:
+        t[k] = k
+    res['insert'] = time.perf_counter() - start
+
+    probes = random.sample(keys, len(keys))
+    start = time.perf_counter()
+    for k in probes:
+        t[k]
+    res['lookup'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in t.items():
+        pass
+    res['iterate'] = time.perf_counter() - start
+
+    irange = (lambda lo, hi: _dict_irange(t, lo, hi)) if cls is dict else t.irange
+    start = time.perf_counter()
+    for lo, hi in ranges:
+        for _ in irange(lo, hi):
+            pass
+    res['range-scan'] = time.perf_counter() - start
+    return res
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(0)
+    keys = random.sample(range(10 * n), n)
+    ranges = [(lo, lo + 100) for lo in random.sample(range(10 * n), 100)]
+
+    backends = [Node, AVLNode, BlockTree, dict]
+    workloads = ('insert', 'lookup', 'iterate', 'range-scan')
+
+    print(f'n = {n}, random insertion order, 100 range scans over ~10 keys each; seconds')
+    print(f'{"backend":>10} ' + ' '.join(f'{w:>10}' for w in workloads))
+    for cls in backends:
+        res = bench(cls, keys, ranges)
+        print(f'{cls.__name__:>10} ' + ' '.join(f'{res[w]:>10.4f}' for w in workloads))
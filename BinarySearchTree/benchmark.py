@@ -0,0 +1,112 @@
+import random
+import sys
+import time
+from tree import Node, AVLNode
+
+def depth(tree):
+    """
+    Depth of the tree, i.e., number of nodes on the longest root-to-leaf path.
+    """
+    if not tree._haskey__():
+        return 0
+    deepest = 0
+    stack = [(tree, 1)]
+    while stack:
+        node, d = stack.pop()
+        deepest = max(deepest, d)
+        for child in (node.left, node.right):
+            if isinstance(child, Node):
+                stack.append((child, d + 1))
+    return deepest
+
+def bench_insert(cls, keys):
+    """
+    Inserts `keys` into a fresh tree of class `cls` and looks all of them up again.
+
+    Return:
+    (insert_seconds, lookup_seconds, depth) or None if the tree hit the recursion limit.
+    """
+    t = cls()
+    try:
+        start = time.perf_counter()
+        for k in keys:
+            t[k] = k
+        insert_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for k in keys:
+            t[k]
+        lookup_time = time.perf_counter() - start
+    except RecursionError:
+        return None
+    return insert_time, lookup_time, depth(t)
+
+def bench_setops(cls, n):
+    """
+    Times merge (`+`, `+=`) and difference (`-`) of two half-overlapping trees with `n` keys each,
+    membership tests along the search path versus a full scan over all keys,
+    and bulk-loading `2n` sorted keys.
+    """
+    keys = random.sample(range(2 * n), 2 * n)
+    a, b = cls(), cls()
+    for k in keys[:n]:
+        a[k] = k
+    for k in keys[n // 2:n // 2 + n]:
+        b[k] = k
+
+    res = {}
+    start = time.perf_counter()
+    a + b
+    res['+'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    a - b
+    res['-'] = time.perf_counter() - start
+
+    probes = keys[:100]
+    start = time.perf_counter()
+    for k in probes:
+        k in a
+    res['in (path)'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for k in probes:
+        any(k == key for key in a.keys())
+    res['in (scan)'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    a += b
+    res['+='] = time.perf_counter() - start
+
+    pairs = sorted(zip(keys, keys))
+    start = time.perf_counter()
+    cls.from_sorted(pairs)
+    res['from_sorted'] = time.perf_counter() - start
+    return res
+
+def report(name, order, n, res):
+    if res is None:
+        print(f'{name:>8} {order:>7} {n:>8}   RecursionError')
+        return
+    insert_time, lookup_time, d = res
+    print(f'{name:>8} {order:>7} {n:>8} {insert_time:>10.4f} {lookup_time:>10.4f} {d:>6}')
+
+if __name__ == '__main__':
+
+    sizes = [int(a) for a in sys.argv[1:]] or [500, 2000, 5000]
+    random.seed(0)
+
+    print(f'{"class":>8} {"order":>7} {"n":>8} {"insert[s]":>10} {"lookup[s]":>10} {"depth":>6}')
+    for n in sizes:
+        sorted_keys = list(range(n))
+        random_keys = random.sample(sorted_keys, n)
+        for order, keys in (('sorted', sorted_keys), ('random', random_keys)):
+            for cls in (Node, AVLNode):
+                report(cls.__name__, order, n, bench_insert(cls, keys))
+
+    print()
+    print(f'{"class":>8} {"n":>8} ' + ' '.join(f'{op:>10}' for op in ('+', '-', 'in (path)', 'in (scan)', '+=', 'from_sorted')))
+    for n in sizes:
+        for cls in (Node, AVLNode):
+            res = bench_setops(cls, n)
+            print(f'{cls.__name__:>8} {n:>8} ' + ' '.join(f'{t:>10.4f}' for t in res.values()))
@@ -0,0 +1,166 @@
+from bisect import bisect_left, bisect_right
+
+class BlockTree():
+    """
+    Sorted map on a two-level, B-tree-like layout: keys live in sorted blocks of
+    at most `2 * fanout` entries, and `_maxes` holds the largest key of each block.
+
+    A lookup bisects `_maxes` and then the block, so it touches three Python lists
+    instead of one node object per tree level. Blocks are split when they grow too
+    large and dropped when they run empty.
+
+    The interface is that of `tree.Node`: `t[key] = value`, `t[key]`, `del t[key]`, `key in t`,
+    `keys()`/`values()`/`items()` in ascending order and range scans via `irange()`.
+    """
+
+    def __init__(self, fanout=512):
+        self.fanout = fanout
+        self._maxes = []
+        self._keys = []
+        self._values = []
+        self._len = 0
+
+    @classmethod
+    def from_sorted(cls, items, fanout=512):
+        """
+        Bulk-loads the blocks in O(n).
+
+        Input:
+        items: iterable
+            (key, value) pairs in strictly ascending key order
+        """
+        t = cls(fanout=fanout)
+        items = list(items)
+        assert all(a[0] < b[0] for a, b in zip(items, items[1:])), 'Keys need to be unique and in ascending order.'
+        for start in range(0, len(items), fanout):
+            block = items[start:start + fanout]
+            t._keys.append([k for k, _ in block])
+            t._values.append([v for _, v in block])
+            t._maxes.append(block[-1][0])
+        t._len = len(items)
+        return t
+
+    def _locate(self, key):
+        # (block, position) where `key` is or would be inserted; block is len(_maxes) if key is larger than all keys
+        b = bisect_left(self._maxes, key)
+        if b == len(self._maxes):
+            return b, 0
+        return b, bisect_left(self._keys[b], key)
+
+    def __contains__(self, key):
+        b, i = self._locate(key)
+        return b < len(self._maxes) and self._keys[b][i] == key
+
+    def __getitem__(self, key):
+        b, i = self._locate(key)
+        if b == len(self._maxes) or self._keys[b][i] != key:
+            raise ValueError(f'Element "{key}" not in Datastructure.')
+        return self._values[b][i]
+
+    def __setitem__(self, key, value):
+        if not self._maxes:
+            self._maxes.append(key)
+            self._keys.append([key])
+            self._values.append([value])
+            self._len = 1
+            return
+
+        b, i = self._locate(key)
+        if b == len(self._maxes):
+            # larger than all keys: append to the last block
+            b -= 1
+            i = len(self._keys[b])
+            self._maxes[b] = key
+        elif self._keys[b][i] == key:
+            self._values[b][i] = value
+            return
+
+        keys, values = self._keys[b], self._values[b]
+        keys.insert(i, key)
+        values.insert(i, value)
+        self._len += 1
+
+        if len(keys) > 2 * self.fanout:
+            half = len(keys) // 2
+            self._keys[b:b + 1] = [keys[:half], keys[half:]]
+            self._values[b:b + 1] = [values[:half], values[half:]]
+            self._maxes[b:b + 1] = [keys[half - 1], keys[-1]]
+
+    def __delitem__(self, key):
+        b, i = self._locate(key)
+        if b == len(self._maxes) or self._keys[b][i] != key:
+            raise ValueError(f'Element "{key}" not in Datastructure.')
+
+        keys, values = self._keys[b], self._values[b]
+        del keys[i]
+        del values[i]
+        self._len -= 1
+        if keys:
+            self._maxes[b] = keys[-1]
+        else:
+            del self._keys[b]
+            del self._values[b]
+            del self._maxes[b]
+
+    def __len__(self):
+        return self._len
+
+    def keys(self):
+        for keys in self._keys:
+            yield from keys
+
+    def values(self):
+        for values in self._values:
+            yield from values
+
+    def items(self):
+        for keys, values in zip(self._keys, self._values):
+            yield from zip(keys, values)
+
+    def min(self):
+        if not self._maxes: raise ValueError('Tree is empty.')
+        return self._keys[0][0]
+
+    def max(self):
+        if not self._maxes: raise ValueError('Tree is empty.')
+        return self._maxes[-1]
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True)):
+        """
+        Lazily yields (key, value) pairs with `lo` <= key <= `hi` in ascending order.
+
+        Input:
+        lo, hi:
+            bounds of the range; None means unbounded
+        inclusive: tuple(bool, bool)
+            whether `lo` and `hi` themselves are part of the range
+        """
+        if lo is None:
+            b, i = 0, 0
+        else:
+            find = bisect_left if inclusive[0] else bisect_right
+            b = find(self._maxes, lo)
+            i = find(self._keys[b], lo) if b < len(self._maxes) else 0
+
+        while b < len(self._maxes):
+            keys, values = self._keys[b], self._values[b]
+            if hi is None or keys[-1] < hi:
+                end = len(keys)
+            else:
+                end = (bisect_right if inclusive[1] else bisect_left)(keys, hi, i)
+            for j in range(i, end):
+                yield keys[j], values[j]
+            if end < len(keys):
+                return
+            b, i = b + 1, 0
+
+    def __str__(self):
+        return '{' + ', '.join(f'{k}: {v}' for k, v in self.items()) + '}'
+
+if __name__ == '__main__':
+    T = BlockTree(fanout=2)
+    for k in 'bcdenmlo':
+        T[k] = ord(k)
+    del T['d']
+    print(T, len(T))
+    print(list(T.irange('c', 'm')))
@@ -0,0 +1,77 @@
+import random
+import sys
+import threading
+import time
+from tree import AVLNode
+from persistent import SharedTree
+
+class _LockedTree():
+    # baseline: a mutable AVLNode where readers and the writer share one lock
+    def __init__(self):
+        self._tree = AVLNode()
+        self._lock = threading.Lock()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._tree[key] = value
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._tree[key]
+
+def run(table, readers, n, duration):
+    """
+    One writer overwrites random keys while `readers` threads look up random keys for `duration` seconds.
+
+    Return:
+    (reads_per_sec, writes_per_sec)
+    """
+    for k in range(n):
+        table[k] = k
+
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def read(r):
+        rng = random.Random(r)
+        view = table.snapshot() if isinstance(table, SharedTree) else table
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                view[rng.randrange(n)]
+            count += 100
+            if isinstance(table, SharedTree):
+                view = table.snapshot() # pick up recent writes
+        reads[r] = count
+
+    def write():
+        rng = random.Random(-1)
+        count = 0
+        while not stop.is_set():
+            k = rng.randrange(n)
+            table[k] = -k
+            count += 1
+        writes[0] = count
+
+    threads = [threading.Thread(target=read, args=(r,)) for r in range(readers)]
+    threads.append(threading.Thread(target=write))
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return sum(reads) / duration, writes[0] / duration
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    duration = 2.0
+
+    print(f'n = {n}, one writer, {duration}s per run')
+    print(f'{"table":>12} {"readers":>8} {"reads/s":>12} {"writes/s":>12}')
+    for readers in (1, 2, 4, 8):
+        for name, cls in (('SharedTree', SharedTree), ('locked AVL', _LockedTree)):
+            r, w = run(cls(), readers, n, duration)
+            print(f'{name:>12} {readers:>8} {r:>12.0f} {w:>12.0f}')
@@ -0,0 +1,158 @@
+import mmap
+import pickle
+import struct
+from array import array
+
+_MAGIC = b'AUDTREE1'
+_HEADER = struct.Struct('=8sQQ') # magic, number of keys, offset of the index
+_KEYLEN = struct.Struct('=I')
+
+class DiskTree():
+    """
+    Read-only sorted map in a file, opened via `mmap`.
+
+    File layout (native byte order):
+        header: magic, number of keys n, offset of the index
+        records: per key `len(key) | key | value`, both pickled, in ascending key order
+        index: n + 1 uint64 offsets; record i spans [index[i], index[i+1])
+
+    Opening only reads the header, so startup costs O(1). Lookups bisect the index
+    and unpickle O(log n) keys straight from the mapped pages; the operating system
+    loads and evicts pages as needed, thus resident memory does not grow with the file.
+
+    Remark: values are unpickled on access, thus only open files you wrote yourself.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        magic, self._len, index_offset = _HEADER.unpack_from(self._mm, 0)
+        assert magic == _MAGIC, f'{path} is not a DiskTree file.'
+        self._index = self._view[index_offset:index_offset + 8 * (self._len + 1)].cast('Q')
+
+    @staticmethod
+    def write(path, items):
+        """
+        Writes (key, value) pairs in strictly ascending key order to `path` in a single pass.
+        Any tree of this package can be written via `DiskTree.write(path, t.items())`.
+        """
+        offsets = array('Q')
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, 0, 0)) # placeholder until n is known
+            pos = _HEADER.size
+            last = None
+            for k, v in items:
+                assert not offsets or last < k, 'Keys need to be unique and in ascending order.'
+                last = k
+                key = pickle.dumps(k)
+                record = _KEYLEN.pack(len(key)) + key + pickle.dumps(v)
+                offsets.append(pos)
+                f.write(record)
+                pos += len(record)
+            offsets.append(pos)
+            f.write(offsets.tobytes())
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, len(offsets) - 1, pos))
+
+    def close(self):
+        self._index.release()
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _key(self, i):
+        start = self._index[i]
+        (keylen,) = _KEYLEN.unpack_from(self._mm, start)
+        return pickle.loads(self._view[start + 4:start + 4 + keylen])
+
+    def _item(self, i):
+        start, end = self._index[i], self._index[i + 1]
+        (keylen,) = _KEYLEN.unpack_from(self._mm, start)
+        key = pickle.loads(self._view[start + 4:start + 4 + keylen])
+        value = pickle.loads(self._view[start + 4 + keylen:end])
+        return key, value
+
+    def _bisect(self, key, right=False):
+        # first record with key >= `key` (or > `key` if `right`)
+        lo, hi = 0, self._len
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k = self._key(mid)
+            if k < key or (right and k == key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        i = self._bisect(key)
+        return i < self._len and self._key(i) == key
+
+    def __getitem__(self, key):
+        i = self._bisect(key)
+        if i < self._len:
+            k, v = self._item(i)
+            if k == key:
+                return v
+        raise ValueError(f'Element "{key}" not in Datastructure.')
+
+    def keys(self):
+        for i in range(self._len):
+            yield self._key(i)
+
+    def values(self):
+        for i in range(self._len):
+            yield self._item(i)[1]
+
+    def items(self):
+        for i in range(self._len):
+            yield self._item(i)
+
+    def min(self):
+        if not self._len: raise ValueError('Tree is empty.')
+        return self._key(0)
+
+    def max(self):
+        if not self._len: raise ValueError('Tree is empty.')
+        return self._key(self._len - 1)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True)):
+        """
+        Lazily yields (key, value) pairs with `lo` <= key <= `hi` in ascending order, in O(log n + k).
+
+        Input:
+        lo, hi:
+            bounds of the range; None means unbounded
+        inclusive: tuple(bool, bool)
+            whether `lo` and `hi` themselves are part of the range
+        """
+        start = 0 if lo is None else self._bisect(lo, right=not inclusive[0])
+        end = self._len if hi is None else self._bisect(hi, right=inclusive[1])
+        for i in range(start, end):
+            yield self._item(i)
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    from tree import AVLNode
+
+    T = AVLNode()
+    for k in 'bcdenmlo':
+        T[k] = ord(k)
+
+    path = os.path.join(tempfile.mkdtemp(), 'tree.aud')
+    DiskTree.write(path, T.items())
+    with DiskTree(path) as D:
+        print(len(D), D['m'], 'x' in D)
+        print(list(D.irange('c', 'm')))
@@ -0,0 +1,66 @@
+import sys
+import tracemalloc
+from tree import Node, AVLNode
+from arraytree import ArrayTree
+
+class _BaselineLeaf():
+    # empty child as before the compact layout: an object with a __dict__, one per child
+    size = 0
+
+class _BaselineNode():
+    """
+    Node layout before `Node` got __slots__ and the shared `_LEAF`: a __dict__ per node
+    and two leaf objects per key. Only kept as baseline for the memory comparison.
+    """
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.left = _BaselineLeaf()
+        self.right = _BaselineLeaf()
+        self.size = 1
+
+    @classmethod
+    def from_sorted(cls, items):
+        # same shape as `Node.from_sorted`
+        def build(lo, hi):
+            if lo >= hi:
+                return _BaselineLeaf()
+            mid = (lo + hi) // 2
+            node = cls(*items[mid])
+            node.right = build(lo, mid)
+            node.left = build(mid + 1, hi)
+            node.size = 1 + node.left.size + node.right.size
+            return node
+        return build(0, len(items))
+
+def bytes_per_key(build, pairs):
+    """
+    Memory allocated by `build(pairs)` per key, measured with tracemalloc.
+    Keys and values are allocated beforehand, thus only the structure itself is counted.
+    """
+    tracemalloc.start()
+    t = build(pairs)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del t
+    return current / len(pairs)
+
+if __name__ == '__main__':
+
+    # e.g. `python memory_benchmark.py 100000 1000000 10000000`
+    sizes = [int(a) for a in sys.argv[1:]] or [10**5, 10**6]
+
+    builders = {
+        'baseline': _BaselineNode.from_sorted, # __dict__ nodes, one leaf per child
+        'Node': Node.from_sorted,
+        'AVLNode': AVLNode.from_sorted,
+        'ArrayTree': ArrayTree.from_sorted,
+        'dict': dict,
+    }
+
+    print(f'{"n":>10} ' + ' '.join(f'{name:>10}' for name in builders) + '   [bytes per key]')
+    for n in sizes:
+        pairs = [(k, k) for k in range(n)]
+        res = [bytes_per_key(build, pairs) for build in builders.values()]
+        print(f'{n:>10} ' + ' '.join(f'{r:>10.1f}' for r in res))
@@ -0,0 +1,199 @@
+import threading
+
+class _PNode():
+    """
+    Immutable AVL node. None is the empty subtree.
+    As in `tree.Node`, larger keys are stored on the left, smaller keys on the right.
+    """
+
+    __slots__ = ('key', 'value', 'left', 'right', 'height', 'size')
+
+    def __init__(self, key, value, left, right):
+        self.key = key
+        self.value = value
+        self.left = left
+        self.right = right
+        self.height = 1 + max(_height(left), _height(right))
+        self.size = 1 + _size(left) + _size(right)
+
+def _height(node):
+    return 0 if node is None else node.height
+
+def _size(node):
+    return 0 if node is None else node.size
+
+def _balance(key, value, left, right):
+    """
+    New node with the given payload and children; rotates if the heights of
+    `left` and `right` differ by two. Only newly created nodes are touched.
+    """
+    hl, hr = _height(left), _height(right)
+    if hl > hr + 1:
+        if _height(left.left) < _height(left.right):
+            lr = left.right
+            return _PNode(lr.key, lr.value, _PNode(left.key, left.value, left.left, lr.left), _PNode(key, value, lr.right, right))
+        return _PNode(left.key, left.value, left.left, _PNode(key, value, left.right, right))
+    if hr > hl + 1:
+        if _height(right.right) < _height(right.left):
+            rl = right.left
+            return _PNode(rl.key, rl.value, _PNode(key, value, left, rl.left), _PNode(right.key, right.value, rl.right, right.right))
+        return _PNode(right.key, right.value, _PNode(key, value, left, right.left), right.right)
+    return _PNode(key, value, left, right)
+
+def _rebuild(path, new):
+    # copies the nodes on `path` bottom-up on top of the new subtree `new`
+    for node, went_left in reversed(path):
+        if went_left:
+            new = _balance(node.key, node.value, new, node.right)
+        else:
+            new = _balance(node.key, node.value, node.left, new)
+    return new
+
+def _insert(root, key, value):
+    path = []
+    node = root
+    while node is not None:
+        if node.key == key:
+            return _rebuild(path, _PNode(key, value, node.left, node.right))
+        went_left = node.key < key
+        path.append((node, went_left))
+        node = node.left if went_left else node.right
+    return _rebuild(path, _PNode(key, value, None, None))
+
+def _pop_smallest(node):
+    # (key, value, subtree without that key) of the smallest key in `node`
+    path = []
+    while node.right is not None:
+        path.append((node, False))
+        node = node.right
+    return node.key, node.value, _rebuild(path, node.left)
+
+def _remove(root, key):
+    path = []
+    node = root
+    while node is not None and node.key != key:
+        went_left = node.key < key
+        path.append((node, went_left))
+        node = node.left if went_left else node.right
+    if node is None:
+        raise ValueError(f'Element "{key}" not in Datastructure.')
+
+    if node.left is None:
+        new = node.right
+    elif node.right is None:
+        new = node.left
+    else:
+        # successor: smallest key within the larger (left) subtree
+        k, v, left = _pop_smallest(node.left)
+        new = _balance(k, v, left, node.right)
+    return _rebuild(path, new)
+
+class PersistentTree():
+    """
+    Immutable, balanced (AVL) search tree with path copying.
+
+    `set()` and `delete()` do not modify the tree, but return a new one in O(log n):
+    only the nodes on the search path are copied, all untouched subtrees are shared.
+    Thus any tree object is a consistent snapshot that can be read from several threads
+    without locks.
+    """
+
+    __slots__ = ('_root',)
+
+    def __init__(self, _root=None):
+        self._root = _root
+
+    def set(self, key, value):
+        return PersistentTree(_insert(self._root, key, value))
+
+    def delete(self, key):
+        return PersistentTree(_remove(self._root, key))
+
+    def _find(self, key):
+        node = self._root
+        while node is not None:
+            if node.key == key: return node
+            node = node.left if node.key < key else node.right
+        return None
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key):
+        node = self._find(key)
+        if node is None:
+            raise ValueError(f'Element "{key}" not in Datastructure.')
+        return node.value
+
+    def __len__(self):
+        return _size(self._root)
+
+    def _inorder(self):
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node
+            node = node.left
+
+    def keys(self):
+        for n in self._inorder():
+            yield n.key
+
+    def values(self):
+        for n in self._inorder():
+            yield n.value
+
+    def items(self):
+        for n in self._inorder():
+            yield n.key, n.value
+
+    def __str__(self):
+        return '{' + ', '.join(f'{k}: {v}' for k, v in self.items()) + '}'
+
+class SharedTree():
+    """
+    Mutable map for many reader threads and a writer, built on `PersistentTree`.
+
+    Writers replace the current tree under a lock; readers take `snapshot()`,
+    which is a single attribute read, and never block or see a half-done update.
+    """
+
+    def __init__(self):
+        self._tree = PersistentTree()
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        return self._tree
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._tree = self._tree.set(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._tree = self._tree.delete(key)
+
+    def __getitem__(self, key):
+        return self._tree[key]
+
+    def __contains__(self, key):
+        return key in self._tree
+
+    def __len__(self):
+        return len(self._tree)
+
+    def items(self):
+        return self._tree.items()
+
+if __name__ == '__main__':
+    T = SharedTree()
+    for k in 'bcdenmlo':
+        T[k] = ord(k)
+    before = T.snapshot()
+    del T['d']
+    print(before, len(before))
+    print(T.snapshot(), len(T))
@@ -1,7 +1,36 @@
 from abc import ABC, abstractmethod
+from operator import itemgetter
+
+_MISSING = object() # marks a key that is absent in one of two merged streams
+
+def _merge(a, b):
+    """
+    Merges two streams of (key, value) pairs, both in ascending key order, in a single pass.
+    Yields triplets (key, value_a, value_b); the value of a stream lacking the key is `_MISSING`.
+    """
+    a, b = iter(a), iter(b)
+    x, y = next(a, None), next(b, None)
+    while x is not None and y is not None:
+        if x[0] == y[0]:
+            yield x[0], x[1], y[1]
+            x, y = next(a, None), next(b, None)
+        elif x[0] < y[0]:
+            yield x[0], x[1], _MISSING
+            x = next(a, None)
+        else:
+            yield y[0], _MISSING, y[1]
+            y = next(b, None)
+    while x is not None:
+        yield x[0], x[1], _MISSING
+        x = next(a, None)
+    while y is not None:
+        yield y[0], _MISSING, y[1]
+        y = next(b, None)
 
 class _AbstractNode(ABC):
 
+    __slots__ = () # no per-instance __dict__; subclasses declare their attributes
+
     @abstractmethod
     def __contains__(self):
         pass
@@ -23,6 +52,14 @@ class _AbstractNode(ABC):
         pass
 
 class _Leaf(_AbstractNode):
+    """
+    Empty child. It is stateless, thus all nodes share the single instance `_LEAF`.
+    """
+
+    __slots__ = ()
+
+    height = 0
+    size = 0
 
     def __init__(self):
         pass
@@ -48,80 +85,147 @@ class _Leaf(_AbstractNode):
     def __len__(self):
         return 0
 
+_LEAF = _Leaf()
+
 class Node(_AbstractNode):
 
+    __slots__ = ('key', 'value', 'left', 'right', 'size')
+
     def __init__(self, key=None, value=None):
 
-        if key:
+        if key is not None:
             self.key = key
         self.value = value
-        self.left = _Leaf()
-        self.right = _Leaf()
+        self.left = _LEAF
+        self.right = _LEAF
+        self.size = 1 if self._haskey__() else 0 # number of keys in this subtree
+
+    def _inorder(self):
+        """
+        Yields the nodes of the tree in ascending key order.
+        Uses an explicit stack, thus a full scan is O(n) and independent of the recursion limit.
+
+        Remark: larger keys are stored on the left, smaller keys on the right.
+        """
+        stack = []
+        node = self
+        while stack or node is not _LEAF:
+            while node is not _LEAF:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node
+            node = node.left
 
     def traverse(self):
         if (k:= not self._haskey__()): raise RuntimeError # key is None -> not a grown tree
-        return [(self.key, self.value)] + self.left.traverse() + self.right.traverse()
+        return [(n.key, n.value) for n in self._inorder()]
 
     def keys(self):
         if (k:= not self._haskey__()): raise RuntimeError # key is None -> not a grown tree
-        yield self.key
-        if not isinstance(self.left, _Leaf):
-            for k in self.left.keys():
-                yield k
-        if not isinstance(self.right, _Leaf):
-            for k in self.right.keys():
-                yield k
+        for n in self._inorder():
+            yield n.key
 
     def values(self):
         if (k:= not self._haskey__()): raise RuntimeError # key is None -> not a grown tree
-        yield self.value
-        if not isinstance(self.left, _Leaf):
-            for v in self.left.values():
-                yield v
-        if not isinstance(self.right, _Leaf):
-            for v in self.right.values():
-                yield v
+        for n in self._inorder():
+            yield n.value
 
     def items(self):
         if (k:= not self._haskey__()): raise RuntimeError # key is None -> not a grown tree
-        yield (self.key, self.value)
-        if not isinstance(self.left, _Leaf):
-            for k, v in self.left.items():
-                yield k, v
-        if not isinstance(self.right, _Leaf):
-            for k, v in self.right.items():
-                yield k, v
+        for n in self._inorder():
+            yield n.key, n.value
+
+    @classmethod
+    def from_sorted(cls, items):
+        """
+        Bulk-loads a perfectly balanced tree in O(n).
+
+        Input:
+        items: iterable
+            (key, value) pairs in strictly ascending key order
+        """
+        items = list(items)
+        assert all(a[0] < b[0] for a, b in zip(items, items[1:])), 'Keys need to be unique and in ascending order.'
+        if not items:
+            return cls()
+        return cls._build(items, 0, len(items))
+
+    @classmethod
+    def from_dict(cls, d):
+        """
+        Bulk-loads a perfectly balanced tree from a dict in O(n log n) (sorting the keys).
+        """
+        return cls.from_sorted(sorted(d.items(), key=itemgetter(0)))
+
+    @classmethod
+    def _build(cls, items, lo, hi):
+        # recursion depth is only log2(n), as the range is halved at each level
+        if lo >= hi:
+            return _LEAF
+        mid = (lo + hi) // 2
+        node = cls(key=items[mid][0], value=items[mid][1])
+        node.right = cls._build(items, lo, mid) # smaller keys
+        node.left = cls._build(items, mid + 1, hi) # larger keys
+        node._refresh()
+        return node
+
+    def _pairs(self):
+        # (key, value) pairs in ascending order; unlike items() also valid for an empty tree
+        if (k:= not self._haskey__()): return iter(()) # key is None -> not a grown tree
+        return ((n.key, n.value) for n in self._inorder())
+
+    def union(self, other, overwrite=True):
+        """
+        All keys of both trees as new, balanced tree in O(n+m).
+        For keys in both trees the value of `other` is taken if `overwrite`, else the value of `self`.
+        """
+        return type(self).from_sorted(
+            (k, vb if vb is not _MISSING and (overwrite or va is _MISSING) else va)
+            for k, va, vb in _merge(self._pairs(), other._pairs())
+        )
+
+    def intersection(self, other):
+        """
+        Keys present in both trees (with the values of `self`) as new, balanced tree in O(n+m).
+        """
+        return type(self).from_sorted(
+            (k, va) for k, va, vb in _merge(self._pairs(), other._pairs())
+            if va is not _MISSING and vb is not _MISSING
+        )
+
+    def difference(self, other):
+        """
+        Keys of `self` that are not in `other` as new, balanced tree in O(n+m).
+        """
+        return type(self).from_sorted(
+            (k, va) for k, va, vb in _merge(self._pairs(), other._pairs())
+            if vb is _MISSING and va is not _MISSING
+        )
+
+    def _adopt(self, other):
+        # this (root) object takes over the content of the root of `other`
+        self.key, self.value, self.left, self.right = other.key, other.value, other.left, other.right
+        self._refresh()
 
     def __iadd__(self, other, overwrite=True):
         if (k:= not self._haskey__()): raise RuntimeError # key is None -> not a grown tree
         if (k:= not other._haskey__()): raise RuntimeError # key is None -> not a grown tree
         assert type(self.key) == type(other.key), f'Keys need to be of same type; But they are ({type(self.key)} <-> {type(other.key)}).'
-        for k, v in other.items():
-            if k not in self or overwrite:
-                self[k] = v
+        self._adopt(self.union(other, overwrite=overwrite))
         return self
 
     def __add__(self, other, overwrite=True):
         if (k:= not self._haskey__()): raise RuntimeError # key is None -> not a grown tree
         if (k:= not other._haskey__()): raise RuntimeError # key is None -> not a grown tree
         assert type(self.key) == type(other.key), f'Keys need to be of same type; But they are ({type(self.key)} <-> {type(other.key)}).'
-        new = Node()
-        for k, v in self.items():
-            new[k] = v
-        for k, v in other.items():
-            if k not in self or overwrite:
-                new[k] = v
-        return new
+        return self.union(other, overwrite=overwrite)
 
     def __sub__(self, other):
         if (k:= not self._haskey__()): raise RuntimeError # key is None -> not a grown tree
         if (k:= not other._haskey__()): raise RuntimeError # key is None -> not a grown tree
         assert type(self.key) == type(other.key), f'Keys need to be of same type; But they are ({type(self.key)} <-> {type(other.key)}).'
-        new = Node()
-        for k, v in self.items():
-            if k not in other:
-                new[k] = v
-        return new
+        return self.difference(other)
 
     def _haskey__(self):
         return hasattr(self,'key')
@@ -129,37 +233,337 @@ class Node(_AbstractNode):
     def __str__(self):
         return f' ({str(self.left)} - {str(self.key)}: {str(self.value)} - {str(self.right)}) '
 
+    def _find(self, key):
+        # follows the search path; returns the node holding `key` or None
+        if (k:= not self._haskey__()): return None # key is None -> not a grown tree
+        node = self
+        while node is not _LEAF:
+            if node.key == key: return node
+            node = node.left if node.key < key else node.right
+        return None
+
     def __contains__(self, key):
-        if (k:= not self._haskey__()): return k # key is None -> not a grown tree
-        return self.key == key or (key in self.left) or (key in self.right)
+        return self._find(key) is not None
 
     def __getitem__(self, key):
         if (k:= not self._haskey__()): raise ValueError # key is None -> not a grown tree
-        if self.key==key: return self.value
-        if self.key < key:
-            return self.left[key]
-        if self.key > key:
-            return self.right[key]
+        node = self._find(key)
+        if node is None:
+            raise ValueError(f'Element "{key}" not in Datastructure.')
+        return node.value
+
+    def min(self):
+        """
+        Smallest key in O(log n).
+        """
+        if (k:= not self._haskey__()): raise ValueError('Tree is empty.') # key is None -> not a grown tree
+        node = self
+        while node.right is not _LEAF:
+            node = node.right
+        return node.key
+
+    def max(self):
+        """
+        Largest key in O(log n).
+        """
+        if (k:= not self._haskey__()): raise ValueError('Tree is empty.') # key is None -> not a grown tree
+        node = self
+        while node.left is not _LEAF:
+            node = node.left
+        return node.key
+
+    def pop_min(self):
+        """
+        Removes the smallest key and returns it as (key, value) pair.
+        """
+        key = self.min()
+        value = self[key]
+        del self[key]
+        return key, value
+
+    def floor(self, key):
+        """
+        Largest key less or equal `key`, in O(log n).
+        """
+        best = _MISSING
+        node = self if self._haskey__() else _LEAF
+        while node is not _LEAF:
+            if node.key == key: return node.key
+            if node.key < key:
+                best = node.key
+                node = node.left
+            else:
+                node = node.right
+        if best is _MISSING:
+            raise ValueError(f'No element less or equal "{key}" in Datastructure.')
+        return best
+
+    def ceiling(self, key):
+        """
+        Smallest key larger or equal `key`, in O(log n).
+        """
+        best = _MISSING
+        node = self if self._haskey__() else _LEAF
+        while node is not _LEAF:
+            if node.key == key: return node.key
+            if node.key > key:
+                best = node.key
+                node = node.right
+            else:
+                node = node.left
+        if best is _MISSING:
+            raise ValueError(f'No element larger or equal "{key}" in Datastructure.')
+        return best
+
+    def rank(self, key):
+        """
+        Number of keys less than `key`, in O(log n); `key` itself does not need to be in the tree.
+        """
+        r = 0
+        node = self if self._haskey__() else _LEAF
+        while node is not _LEAF:
+            if node.key < key:
+                r += 1 + node.right.size
+                node = node.left
+            elif node.key > key:
+                node = node.right
+            else:
+                return r + node.right.size
+        return r
+
+    def select(self, i):
+        """
+        The `i`-th smallest key (starting at 0), in O(log n).
+        """
+        if not 0 <= i < len(self):
+            raise IndexError(f'Index {i} out of range for tree with {len(self)} elements.')
+        node = self
+        while True:
+            smaller = node.right.size
+            if i < smaller:
+                node = node.right
+            elif i == smaller:
+                return node.key
+            else:
+                i -= smaller + 1
+                node = node.left
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True)):
+        """
+        Lazily yields (key, value) pairs with `lo` <= key <= `hi` in ascending order, in O(log n + k).
+
+        Input:
+        lo, hi:
+            bounds of the range; None means unbounded
+        inclusive: tuple(bool, bool)
+            whether `lo` and `hi` themselves are part of the range
+        """
+        if (k:= not self._haskey__()): return # key is None -> not a grown tree
+
+        # descend to `lo`, remembering all nodes within the range on the way
+        stack = []
+        node = self
+        while node is not _LEAF:
+            if lo is None or node.key > lo or (inclusive[0] and node.key == lo):
+                stack.append(node)
+                node = node.right
+            else:
+                node = node.left
+
+        while stack:
+            node = stack.pop()
+            if hi is not None and (node.key > hi or (not inclusive[1] and node.key == hi)):
+                return
+            yield node.key, node.value
+            node = node.left
+            while node is not _LEAF:
+                stack.append(node)
+                node = node.right
+
+    def _refresh(self):
+        # recomputes the bookkeeping of this node from its children
+        self.size = 1 + self.left.size + self.right.size
+
+    def _grow(self, key, value):
+        # turns an empty tree into a tree with a single key
+        self.key = key
+        self.value = value
+        self.size = 1
+
+    def _clear(self):
+        # turns a single-key tree into an empty tree
+        del self.key
+        self.value = None
+        self.size = 0
+
+    def _insert(self, key, value):
+        """
+        Inserts or overwrites `key` without recursion.
+
+        Return:
+        path: list
+            nodes from the root down to the newly created node, or None if an existing key was overwritten.
+        """
+        if (k:= not self._haskey__()): self._grow(key, value); return [self] # override default init with None
+
+        path = []
+        node = self
+        while True:
+            path.append(node)
+            if node.key == key: node.value = value; return None
+            if node.key < key:
+                if node.left is _LEAF:
+                    node.left = type(self)(key=key, value=value)
+                    break
+                node = node.left
+            else:
+                if node.right is _LEAF:
+                    node.right = type(self)(key=key, value=value)
+                    break
+                node = node.right
+
+        for n in path:
+            n.size += 1
+        path.append(node.left if node.key < key else node.right)
+        return path
+
+    def _remove(self, key):
+        """
+        Removes `key` without recursion.
+        A node with two children takes over key and value of its in-order successor,
+        which is removed instead.
+
+        Return:
+        path: list
+            nodes from the root down to the parent of the removed node, i.e., all nodes whose subtree changed.
+        """
+        if (k:= not self._haskey__()): raise ValueError # key is None -> not a grown tree
+
+        path = []
+        node = self
+        while node is not _LEAF and node.key != key:
+            path.append(node)
+            node = node.left if node.key < key else node.right
+        if node is _LEAF:
+            raise ValueError(f'Element "{key}" not in Datastructure.')
+
+        if node.left is not _LEAF and node.right is not _LEAF:
+            # successor: smallest key within the larger (left) subtree
+            path.append(node)
+            succ = node.left
+            while succ.right is not _LEAF:
+                path.append(succ)
+                succ = succ.right
+            node.key, node.value = succ.key, succ.value
+            node = succ
+
+        child = node.left if node.left is not _LEAF else node.right
+        if not path:
+            # removing the root object itself; it has to stay the root, so it takes over its child
+            if child is not _LEAF:
+                node._adopt(child)
+                return [node]
+            node._clear()
+            return []
+
+        for n in path:
+            n.size -= 1
+        parent = path[-1]
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        return path
 
     def __setitem__(self, key, value):
-        if (k:= not self._haskey__()): self.key=key; self.value=value; return # override default init with None
-        if self.key == key: self.value = value; return
+        self._insert(key, value)
 
-        if self.key < key:
-            if isinstance(self.left, _Leaf):
-                self.left = Node(key=key, value=value)
-            else:
-                self.left[key] = value
-            return
-        if self.key > key:
-            if isinstance(self.right, _Leaf):
-                self.right = Node(key=key, value=value)
-            else:
-                self.right[key] = value
-            return
+    def __delitem__(self, key):
+        self._remove(key)
 
     def __len__(self):
-        return 1 + len(self.left) + len(self.right)
+        return self.size
+
+class AVLNode(Node):
+    """
+    Self-balancing variant of `Node` (AVL tree).
+
+    After every insert the heights of both subtrees of each node differ by at
+    most one, so the depth stays O(log n) -- also when keys arrive in sorted order.
+    Rotations swap key and value between nodes instead of re-linking the parent,
+    so the root object stays the same and can be used just like a `Node`.
+    """
+
+    __slots__ = ('height',)
+
+    def __init__(self, key=None, value=None):
+        super().__init__(key=key, value=value)
+        self.height = 1 if self._haskey__() else 0
+
+    def _refresh(self):
+        super()._refresh()
+        self.height = 1 + max(self.left.height, self.right.height)
+
+    def _swap_payload(self, other):
+        self.key, other.key = other.key, self.key
+        self.value, other.value = other.value, self.value
+
+    def _rotate_right(self):
+        # lifts self.left to the top of this subtree
+        pivot = self.left
+        self._swap_payload(pivot)
+        self.left = pivot.left
+        pivot.left = pivot.right
+        pivot.right = self.right
+        self.right = pivot
+        pivot._refresh()
+        self._refresh()
+
+    def _rotate_left(self):
+        # lifts self.right to the top of this subtree
+        pivot = self.right
+        self._swap_payload(pivot)
+        self.right = pivot.right
+        pivot.right = pivot.left
+        pivot.left = self.left
+        self.left = pivot
+        pivot._refresh()
+        self._refresh()
+
+    def _rebalance(self):
+        balance = self.left.height - self.right.height
+        if balance > 1:
+            if self.left.left.height < self.left.right.height:
+                self.left._rotate_left()
+            self._rotate_right()
+        elif balance < -1:
+            if self.right.right.height < self.right.left.height:
+                self.right._rotate_right()
+            self._rotate_left()
+        else:
+            self._refresh()
+
+    def _grow(self, key, value):
+        super()._grow(key, value)
+        self.height = 1
+
+    def _clear(self):
+        super()._clear()
+        self.height = 0
+
+    def __setitem__(self, key, value):
+        path = self._insert(key, value)
+        if path is None:
+            return
+        for node in reversed(path[:-1]):
+            height = node.height
+            node._rebalance()
+            if node.height == height:
+                break # subtree has the same height as before, thus ancestors are balanced
+
+    def __delitem__(self, key):
+        for node in reversed(self._remove(key)):
+            node._rebalance()
 
 if __name__ == '__main__':
     T1 = Node()
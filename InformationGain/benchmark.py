@@ -0,0 +1,54 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from informationgain import find_split, split, _infogain
+
+def make_data(n, n_cols=4, n_classes=3, noise=0.0, seed=0):
+    """
+    Synthetic classification frame with `n` rows of continuous features;
+    the class depends on the first two features, and a fraction `noise` of the labels is random.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, n_cols)).round(3)
+    gt = (X[:, 0] > 0).astype(int) + (X[:, 1] > 0.5).astype(int)
+    gt = np.minimum(gt, n_classes - 1)
+    flip = rng.random(n) < noise
+    gt[flip] = rng.integers(0, n_classes, flip.sum())
+    df = pd.DataFrame(X, columns=[f'x{i}' for i in range(n_cols)])
+    df['gt'] = gt
+    return df
+
+def per_value_split(df, gt_col, col, vals):
+    """
+    Reference: scores `vals` one by one via `split()` and `_infogain()`, i.e. with two DataFrame copies per value.
+    """
+    best = (None, -1 * np.inf)
+    for v in vals:
+        df_low, df_high = split(df=df, splitcol=col, splitval=v)
+        ig = _infogain([df, df_low, df_high], gt_col=gt_col)
+        if ig > best[1]:
+            best = (v, ig)
+    return best
+
+if __name__ == '__main__':
+
+    sizes = [int(a) for a in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    n_ref_vals = 50
+
+    print(f'{"rows":>9} {"thresholds":>11} {"sweep[s]":>10} {"per value[s]":>13} {"per value, extrapolated[s]":>27}')
+    for n in sizes:
+        df = make_data(n)
+        n_thresholds = sum(df[c].nunique() - 1 for c in df.keys() if c != 'gt')
+
+        start = time.perf_counter()
+        find_split(df, gt_col='gt', samplecols='all', samplevals='all')
+        sweep = time.perf_counter() - start
+
+        # the per-value search is only run on a few thresholds and extrapolated
+        vals = np.sort(df['x0'].unique())[:-1][:n_ref_vals]
+        start = time.perf_counter()
+        per_value_split(df, 'gt', 'x0', vals)
+        ref = time.perf_counter() - start
+
+        print(f'{n:>9} {n_thresholds:>11} {sweep:>10.3f} {ref:>13.3f} {ref / len(vals) * n_thresholds:>27.1f}')
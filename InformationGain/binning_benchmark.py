@@ -0,0 +1,25 @@
+import sys
+import time
+import numpy as np
+from random_tree import random_tree
+from benchmark import make_data
+
+def accuracy(tree, df, gt_col):
+    return (df.apply(tree.predict, axis=1) == df[gt_col]).mean()
+
+if __name__ == '__main__':
+
+    sizes = [int(a) for a in sys.argv[1:]] or [10**4, 10**5]
+    n_test = 2000
+
+    print(f'{"rows":>8} {"max_bins":>9} {"train[s]":>9} {"test acc":>9}')
+    for n in sizes:
+        df = make_data(n + n_test, n_cols=8, noise=0.1)
+        train, test = df.iloc[:n], df.iloc[n:]
+        for max_bins in (None, 255, 32):
+            np.random.seed(0)
+            tree = random_tree(samplecols='sqrt', max_bins=max_bins)
+            start = time.perf_counter()
+            tree.train(train, gt_col='gt')
+            duration = time.perf_counter() - start
+            print(f'{n:>8} {str(max_bins):>9} {duration:>9.2f} {accuracy(tree, test, "gt"):>9.3f}')
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+class FlatTree():
+    """
+    A trained `random_tree`, flattened into parallel arrays; node 0 is the root.
+
+    feature: index into `cols` of the split column; -1 for leaves
+    threshold: samples with value <= threshold go to `left`, the others to `right`
+    left, right: indices of the child nodes; -1 for leaves
+    leaf_class: index into `classes` of the predicted class of each node
+    leaf_counts: training samples per class in each leaf, shape (nodes, classes); zeros for inner nodes
+
+    All rows of a batch are routed together, one tree level per step, with
+    vectorized comparisons instead of one Python call per row and node.
+    """
+
+    ARRAYS = ('feature', 'threshold', 'left', 'right', 'leaf_class', 'leaf_counts')
+
+    def __init__(self, tree, classes=None, cols=None):
+        """
+        Input:
+        tree: random_tree
+            trained tree to flatten
+        classes: array-like or None
+            sorted class labels; if None, the classes the tree was trained on
+        cols: list or None
+            columns the feature indices refer to, e.g., shared by all trees of a forest;
+            if None, the split columns of the tree
+        """
+
+        assert tree.istrained, f'Tree not trained, thus can not be compiled'
+
+        # pre-order walk with an explicit stack; ids are assigned when a node is visited
+        nodes = []
+        parents = [] # (parent id, is_left) of each node
+        stack = [(tree, -1, False)]
+        while stack:
+            node, parent, is_left = stack.pop()
+            nodes.append(node)
+            parents.append((parent, is_left))
+            if node.left is not None:
+                me = len(nodes) - 1
+                stack.append((node.right, me, False))
+                stack.append((node.left, me, True))
+
+        n = len(nodes)
+        labels = [node.mode_class[0] for node in nodes]
+        self.classes = np.asarray(tree.classes if classes is None else classes)
+        if cols is None:
+            cols = sorted({node.split_col for node in nodes if node.left is not None}, key=str)
+        self.cols = list(cols)
+
+        col_index = {c: j for j, c in enumerate(self.cols)}
+        self.feature = np.full(n, -1, dtype=np.int32)
+        self.left = np.full(n, -1, dtype=np.int32)
+        self.right = np.full(n, -1, dtype=np.int32)
+        thresholds = [np.nan] * n
+        for i, node in enumerate(nodes):
+            if node.left is not None:
+                self.feature[i] = col_index[node.split_col]
+                thresholds[i] = node.split_val
+        for i, (parent, is_left) in enumerate(parents):
+            if parent >= 0:
+                (self.left if is_left else self.right)[parent] = i
+        self.threshold = np.array(thresholds)
+        self.leaf_class = np.searchsorted(self.classes, labels).astype(np.int32)
+
+        self.leaf_counts = np.zeros((n, len(self.classes)), dtype=np.int32)
+        for i, node in enumerate(nodes):
+            if node.left is None:
+                self.leaf_counts[i, np.searchsorted(self.classes, node.classes)] = node.class_counts
+
+    @classmethod
+    def from_arrays(cls, cols, classes, **arrays):
+        """
+        Restores a flattened tree from its arrays (see `ARRAYS`), e.g. memory-mapped from a file.
+        """
+        flat = cls.__new__(cls)
+        flat.cols = list(cols)
+        flat.classes = np.asarray(classes)
+        for name in cls.ARRAYS:
+            setattr(flat, name, arrays[name])
+        return flat
+
+    def __len__(self):
+        return len(self.feature)
+
+    def apply(self, X):
+        """
+        Leaf node of each row of X, shape (m, len(cols)); columns in the order of `cols`.
+        """
+        node = np.zeros(len(X), dtype=np.int32)
+        active = np.arange(len(X))
+        while active.size:
+            at = node[active]
+            inner = self.feature[at] >= 0
+            active, at = active[inner], at[inner]
+            go_left = X[active, self.feature[at]] <= self.threshold[at]
+            node[active] = np.where(go_left, self.left[at], self.right[at])
+        return node
+
+    def predict_codes(self, X):
+        """
+        Index into `classes` of the predicted class of each row of X.
+        """
+        return self.leaf_class[self.apply(X)]
+
+    def predict_proba(self, X):
+        """
+        Class distribution of the leaf of each row of X, shape (m, len(classes)).
+        """
+        counts = self.leaf_counts[self.apply(X)]
+        return counts / counts.sum(axis=1, keepdims=True)
+
+    def predict_proba_batch(self, df):
+        """
+        Class distribution of every row of df, as pd.DataFrame with the index of df and one column per class.
+        """
+        return pd.DataFrame(self.predict_proba(df[self.cols].to_numpy()), index=df.index, columns=self.classes)
+
+    def predict_batch(self, df):
+        """
+        Predicted class of every row of df, as pd.Series with the index of df.
+        """
+        codes = self.predict_codes(df[self.cols].to_numpy())
+        return pd.Series(self.classes[codes], index=df.index)
+
+class FlatForest():
+    """
+    Flattened trees over the same columns and classes, e.g., of a `RandomForest`.
+
+    voting: str
+        'hard': predict the majority vote of the trees,
+        'soft': predict the class with the highest averaged probability of the trees
+    """
+
+    def __init__(self, trees, cols, classes, voting='hard'):
+        self.trees = trees
+        self.cols = list(cols)
+        self.classes = np.asarray(classes)
+        self.voting = voting
+
+    def __len__(self):
+        return len(self.trees)
+
+    def votes(self, X):
+        """
+        Number of trees voting for each class, shape (m, len(classes)).
+        """
+        votes = np.zeros((len(X), len(self.classes)), dtype=np.int64)
+        rows = np.arange(len(X))
+        for ft in self.trees:
+            votes[rows, ft.predict_codes(X)] += 1
+        return votes
+
+    def predict_proba(self, X):
+        """
+        Class distributions averaged over all trees, shape (m, len(classes)).
+        """
+        proba = np.zeros((len(X), len(self.classes)))
+        for ft in self.trees:
+            proba += ft.predict_proba(X)
+        return proba / len(self.trees)
+
+    def predict_batch(self, df):
+        """
+        Predicted class of every row of df, as pd.Series with the index of df; ties go to the smallest class.
+        """
+        X = df[self.cols].to_numpy()
+        scores = self.predict_proba(X) if self.voting == 'soft' else self.votes(X)
+        return pd.Series(self.classes[np.argmax(scores, axis=1)], index=df.index)
+
+    def predict_proba_batch(self, df):
+        """
+        Averaged class distribution of every row of df, as pd.DataFrame with the index of df and one column per class.
+        """
+        return pd.DataFrame(self.predict_proba(df[self.cols].to_numpy()), index=df.index, columns=self.classes)
@@ -0,0 +1,27 @@
+import sys
+import numpy as np
+from random_tree import random_tree
+from benchmark import make_data
+
+def grow(df, max_bins):
+    np.random.seed(0)
+    tree = random_tree(max_bins=max_bins)
+    tree.train(df, gt_col='gt')
+    return tree.stats
+
+if __name__ == '__main__':
+
+    sizes = [int(a) for a in sys.argv[1:]] or [2500, 5000, 10000, 20000, 40000]
+
+    for max_bins in (None, 255):
+        print(f'max_bins={max_bins}')
+        print(f'{"rows":>7} {"nodes":>6} {"depth":>6} {"rows visited":>13} {"thresholds":>11} {"split[s]":>9} {"partition[s]":>13} {"hists[s]":>9} {"other[s]":>9} {"total[s]":>9} {"exponent":>9}')
+        previous = None
+        for n in sizes:
+            s = grow(make_data(n, n_cols=8, noise=0.1), max_bins)
+            # slope of log(time) over log(rows) since the previous size, i.e. time ~ rows**exponent
+            exponent = np.log(s.total_time / previous[1]) / np.log(n / previous[0]) if previous else np.nan
+            previous = (n, s.total_time)
+            other = s.total_time - s.split_time - s.partition_time - s.hist_time - s.quantize_time # per-node overhead, e.g. class counts
+            print(f'{n:>7} {s.n_nodes:>6} {s.max_depth:>6} {s.rows:>13} {s.thresholds:>11} {s.split_time:>9.3f} {s.partition_time:>13.3f} {s.hist_time:>9.3f} {other:>9.3f} {s.total_time:>9.3f} {exponent:>9.2f}')
+        print()
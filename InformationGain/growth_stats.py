@@ -0,0 +1,89 @@
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# one grown node; `ig` is nan for leaves
+NodeStats = namedtuple('NodeStats', ['depth', 'rows', 'thresholds', 'ig', 'split_time', 'partition_time', 'hist_time'])
+
+class GrowthStats():
+    """
+    Statistics on how a `random_tree` was grown, see `random_tree.train`.
+
+    Aggregates (node and leaf counts, depth, sum of rows over all nodes, candidate thresholds
+    scored, seconds spent searching splits, partitioning rows and counting histograms) are
+    always collected, at the cost of a few additions per node, also per depth.
+
+    Input:
+    trace: bool
+        if True, additionally keeps one `NodeStats` per node, in the order the nodes are grown; see `to_frame`
+    callback: callable or None
+        called with the `NodeStats` of each node as it is grown
+    """
+
+    def __init__(self, trace=False, callback=None):
+
+        self.trace = trace
+        self.callback = callback
+
+        self.nodes = []
+        self.n_nodes = 0
+        self.n_leaves = 0
+        self.max_depth = 0
+        self.rows = 0 # sum over all nodes, i.e. the number of times a sample is visited
+        self.thresholds = 0
+        self.split_time = 0.0
+        self.partition_time = 0.0
+        self.hist_time = 0.0
+        self.quantize_time = 0.0
+        self.total_time = 0.0
+        self._depths = {} # depth -> nodes, rows, thresholds, seconds
+
+    def __str__(self):
+        s = f'{self.n_nodes} nodes ({self.n_leaves} leaves), depth {self.max_depth}, {self.rows} rows visited, {self.thresholds} thresholds scored,\n'
+        s += f'{self.total_time:.3f}s in total: {self.split_time:.3f}s split search, {self.partition_time:.3f}s partitioning, '
+        s += f'{self.hist_time:.3f}s histograms, {self.quantize_time:.3f}s quantizing.\n'
+        return s
+
+    def record(self, depth, rows, thresholds=0, ig=np.nan, split_time=0.0, partition_time=0.0, hist_time=0.0):
+        """
+        Adds one node; leaves are the nodes without information gain.
+        """
+        self.n_nodes += 1
+        if np.isnan(ig):
+            self.n_leaves += 1
+        self.max_depth = max(self.max_depth, depth)
+        self.rows += rows
+        self.thresholds += thresholds
+        self.split_time += split_time
+        self.partition_time += partition_time
+        self.hist_time += hist_time
+        self._depths.setdefault(depth, np.zeros(4))[:] += (1, rows, thresholds, split_time + partition_time + hist_time)
+
+        if self.trace or self.callback is not None:
+            node = NodeStats(depth, rows, thresholds, ig, split_time, partition_time, hist_time)
+            if self.trace:
+                self.nodes.append(node)
+            if self.callback is not None:
+                self.callback(node)
+
+    def summary(self):
+        """
+        The aggregates as dict.
+        """
+        keys = ['n_nodes', 'n_leaves', 'max_depth', 'rows', 'thresholds', 'split_time', 'partition_time', 'hist_time', 'quantize_time', 'total_time']
+        return {k: getattr(self, k) for k in keys}
+
+    def by_depth(self):
+        """
+        Nodes, rows, thresholds and seconds per depth, as pd.DataFrame indexed by depth.
+        """
+        depths = sorted(self._depths)
+        df = pd.DataFrame([self._depths[d] for d in depths], index=pd.Index(depths, name='depth'), columns=['nodes', 'rows', 'thresholds', 'seconds'])
+        return df.astype({'nodes': int, 'rows': int, 'thresholds': int})
+
+    def to_frame(self):
+        """
+        The traced nodes as pd.DataFrame; requires `trace`.
+        """
+        assert self.trace, f'Nodes are only kept with trace=True'
+        return pd.DataFrame(self.nodes, columns=NodeStats._fields)
@@ -0,0 +1,75 @@
+import numpy as np
+from informationgain import _entropy_rows
+
+def quantize(x, max_bins=255):
+    """
+    Quantizes the values of a feature into at most `max_bins` bins.
+
+    If the feature has at most `max_bins` unique values, every value gets its own bin;
+    otherwise the bin edges are quantiles of `x`. Edges are always values of `x`, thus
+    a split `code <= b` is the same as the split `x <= edges[b]` on the raw values.
+
+    Return:
+    (codes, edges)
+    codes: np.ndarray of uint8
+        bin of each value; bin b holds edges[b-1] < x <= edges[b]
+    edges: np.ndarray
+        upper edge of each bin except the last
+    """
+    assert 2 <= max_bins <= 256, f'max_bins needs to be \\in [2|256] to fit uint8 codes, but is {max_bins}.'
+    uniq = np.unique(x)
+    if len(uniq) <= max_bins:
+        edges = uniq[:-1]
+    else:
+        edges = np.unique(np.quantile(x, np.linspace(0, 1, max_bins + 1)[1:-1], method='lower'))
+    codes = np.searchsorted(edges, x, side='left').astype(np.uint8)
+    return codes, edges
+
+def histograms(codes, y, rows, n_bins, n_classes):
+    """
+    Class histograms of all features over the samples `rows`, in a single `bincount`.
+
+    Input:
+    codes: np.ndarray
+        quantized features, shape (n, d)
+    y: np.ndarray
+        class codes \\in [0, n_classes), shape (n,)
+
+    Return:
+    np.ndarray of shape (d, n_bins, n_classes)
+    """
+    d = codes.shape[1]
+    idx = (np.arange(d) * n_bins + codes[rows]) * n_classes + y[rows, np.newaxis]
+    return np.bincount(idx.ravel(), minlength=d * n_bins * n_classes).reshape(d, n_bins, n_classes)
+
+def best_bin_splits(hists):
+    """
+    Best split `code <= b` of each feature, computed from its class histogram only.
+
+    Input:
+    hists: np.ndarray
+        class histograms, shape (s, n_bins, n_classes)
+
+    Return:
+    (bins, igs)
+    bins: np.ndarray
+        best bin of each feature, shape (s,)
+    igs: np.ndarray
+        information gain of splitting there; -inf if the feature can not be split
+    """
+    s, n_bins, k = hists.shape
+    if n_bins < 2: # all features constant, nothing to split
+        return np.zeros(s, dtype=int), np.full(s, -1 * np.inf)
+    total = hists[0].sum(axis=0)
+    n = total.sum()
+
+    low = np.cumsum(hists, axis=1)[:, :-1, :].reshape(-1, k).astype(float)
+    high = total - low
+    n_low = low.sum(axis=1)
+    orig_ent = _entropy_rows(total[np.newaxis, :].astype(float))[0]
+    igs = orig_ent - (n_low / n * _entropy_rows(low) + (n - n_low) / n * _entropy_rows(high))
+    igs[(n_low == 0) | (n_low == n)] = -1 * np.inf
+    igs = igs.reshape(s, n_bins - 1)
+
+    bins = np.argmax(igs, axis=1)
+    return bins, igs[np.arange(s), bins]
@@ -50,6 +50,58 @@ def _infogain(dfs, gt_col):
 
     return orig_ent - (low_ent + high_ent)
 
+def _entropy_rows(counts):
+    """
+    Vectorized entropy of each row of a (m, k) array of class counts, in [bits].
+    Rows of zeros have an entropy of 0 bit.
+    """
+    totals = counts.sum(axis=1, keepdims=True)
+    probs = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+    logs = np.log2(probs, out=np.zeros(counts.shape), where=probs > 0)
+    return -1 * (probs * logs).sum(axis=1)
+
+def split_scores(x, y, n_classes):
+    """
+    Information gain of every possible split `x <= val` in a single sweep.
+
+    The column is sorted once; cumulative class counts along the sorted order
+    then give the class histograms of both sides for all thresholds at once.
+    Thus all thresholds are scored in O(n log n), without copying the data.
+
+    Input:
+    x: np.ndarray
+        feature values, shape (n,)
+    y: np.ndarray
+        class codes \in [0, n_classes), shape (n,)
+
+    Return:
+    (vals, igs)
+    vals: np.ndarray
+        sorted unique values of x, except the largest (splitting there leaves one side empty)
+    igs: np.ndarray
+        information gain of splitting on each value in `vals`
+    """
+    order = np.argsort(x, kind='stable')
+    xs = x[order]
+    ys = y[order]
+
+    # last position of each unique value, except the largest one
+    last = np.flatnonzero(xs[1:] != xs[:-1])
+    vals = xs[last]
+
+    cum = np.empty((len(last), n_classes))
+    for c in range(n_classes):
+        cum[:, c] = np.cumsum(ys == c)[last]
+    total = np.bincount(ys, minlength=n_classes)
+
+    n = len(x)
+    n_low = last + 1
+    low_ent = _entropy_rows(cum)
+    high_ent = _entropy_rows(total - cum)
+    orig_ent = _entropy_rows(total[np.newaxis, :].astype(float))[0]
+    igs = orig_ent - (n_low / n * low_ent + (n - n_low) / n * high_ent)
+    return vals, igs
+
 def _define_mumber_of_samples(method, max_samples):
 
     if isinstance(method, str):
@@ -110,9 +162,34 @@ def find_split(df, gt_col, samplecols='sqrt', samplevals='sqrt', verbose=False):
         dictionary with all tested columns as key and their best information gain as tuple (value_to_split_on, ig)
     """
 
-    cols = set(df.keys()) - set((gt_col,))
+    cols = [c for c in df.keys() if c != gt_col]
     assert len(cols) == len(df.keys()) - 1
-    cols = list(cols)
+
+    y, _ = pd.factorize(df[gt_col])
+    return find_split_arrays(df[cols].to_numpy(), y, cols, samplecols=samplecols, samplevals=samplevals, verbose=verbose)
+
+def find_split_arrays(X, y, cols, samplecols='sqrt', samplevals='sqrt', verbose=False, rows=None, evaluated=None):
+    """
+    `find_split` on a feature matrix instead of a DataFrame.
+
+    Input:
+    X: np.ndarray
+        features, shape (n, d); column j holds the feature named cols[j]
+    y: np.ndarray
+        class codes \in [0, n_classes), shape (n,)
+    cols: list
+        names of the columns of X
+    rows: np.ndarray or None
+        indices of the samples to search the split on; all if None.
+        Only the sampled columns of these rows are gathered, X itself is not copied.
+    evaluated: list or None
+        if a list, the number of thresholds scored on each tested column is appended to it
+
+    For `samplecols`, `samplevals`, `verbose` and the return value, see `find_split`.
+    """
+    if rows is not None:
+        y = y[rows]
+    n_classes = y.max() + 1 if len(y) else 0
 
     if not isinstance(samplecols,list):
         # if no list of columns to test for was provided, randomly select columns to test for
@@ -132,8 +209,13 @@ def find_split(df, gt_col, samplecols='sqrt', samplevals='sqrt', verbose=False):
 
     for c in samplecols:
 
-        # uniq vals in column df[c]
-        vals = sorted(df[c].unique())[:-1]
+        j = cols.index(c)
+        x = X[:, j] if rows is None else X[rows, j]
+
+        # uniq vals in column c (without the largest) and the gain of splitting on each of them
+        vals, col_igs = split_scores(x, y, n_classes)
+        if evaluated is not None:
+            evaluated.append(len(vals))
         if len(vals) == 0:
             if verbose:
                 print('      No variance for this col')
@@ -142,27 +224,18 @@ def find_split(df, gt_col, samplecols='sqrt', samplevals='sqrt', verbose=False):
         v = _define_mumber_of_samples(method=samplevals, max_samples=len(vals))
         assert 0 < v <= len(vals)
 
-        vals = np.random.choice(vals,v,replace=False)
+        chosen = np.random.choice(vals,v,replace=False)
         if verbose:
-            print(f'     With vals: {vals}')
-
-        for v in vals:
-
-            df_low, df_high = split(df=df, splitcol=c, splitval=v)
-            ig = _infogain([df, df_low, df_high], gt_col=gt_col)
+            print(f'     With vals: {chosen}')
 
-            if c not in igs:
-                # no score yet
-                igs[c] = (v, ig)
-            else:
-                if igs[c][1] < ig:
-                    #update score if a better was found
-                    igs[c] = (v, ig)
+        scores = col_igs[np.searchsorted(vals, chosen)]
+        i = np.argmax(scores) # first maximum, i.e. same tie-breaking as testing the values one by one
+        igs[c] = (chosen[i], scores[i])
 
-            if ig > best_ig:
-                best_col = c
-                best_val = v
-                best_ig = ig
+        if scores[i] > best_ig:
+            best_col = c
+            best_val = chosen[i]
+            best_ig = scores[i]
 
     if verbose:
         print('Found IGS:')
@@ -0,0 +1,115 @@
+import json
+import struct
+import numpy as np
+from flat_tree import FlatTree, FlatForest
+
+_MAGIC = b'AUDMODEL'
+_ALIGN = 64 # every array starts at a multiple of this, thus it can be viewed in place
+
+def _jsonable(labels):
+    return [l.item() if isinstance(l, np.generic) else l for l in labels]
+
+def _align(pos):
+    return -(-pos // _ALIGN) * _ALIGN
+
+def save_model(path, model):
+    """
+    Writes a trained `random_tree` or `RandomForest` in a compact binary format.
+
+    Layout:
+        magic, length of the header (uint64), JSON header, then the arrays of `FlatTree.ARRAYS`
+        of all trees, concatenated per array name, plus `tree_offsets` (first node of each tree).
+    The header holds columns, classes, voting and dtype, shape and offset of every array.
+    Thresholds need to be numeric.
+    """
+    if hasattr(model, 'trees'):
+        flat = model.flat if model.flat is not None else model.compile()
+    else:
+        tree_flat = model.flat if model.flat is not None else model.compile()
+        flat = FlatForest([tree_flat], tree_flat.cols, tree_flat.classes)
+
+    arrays = {name: np.concatenate([getattr(t, name) for t in flat.trees]) for name in FlatTree.ARRAYS}
+    assert arrays['threshold'].dtype != object, 'Thresholds need to be numeric to be saved.'
+    arrays['tree_offsets'] = np.cumsum([0] + [len(t) for t in flat.trees]).astype(np.int64)
+
+    header = {'cols': _jsonable(flat.cols), 'classes': _jsonable(flat.classes), 'voting': flat.voting, 'arrays': {}}
+    # offsets depend on the header length, which depends on the offsets; thus reserve room for the header
+    body = 0
+    for name, arr in arrays.items():
+        header['arrays'][name] = {'dtype': arr.dtype.str, 'shape': list(arr.shape), 'offset': body}
+        body = _align(body + arr.nbytes)
+    start = _align(len(_MAGIC) + 8 + len(json.dumps(header)) + 32 * len(arrays))
+    for spec in header['arrays'].values():
+        spec['offset'] += start
+    raw = json.dumps(header).encode()
+    assert len(_MAGIC) + 8 + len(raw) <= start
+
+    with open(path, 'wb') as f:
+        f.write(_MAGIC + struct.pack('=Q', len(raw)) + raw)
+        for name, arr in arrays.items():
+            f.write(b'\0' * (header['arrays'][name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(arr).tobytes())
+
+def load_model(path):
+    """
+    Opens a model written by `save_model` as `FlatForest`.
+
+    The file is memory-mapped read-only and the arrays of all trees are views into it.
+    Thus loading does not read the arrays, and processes serving the same file share
+    one copy in the page cache.
+    """
+    buf = np.memmap(path, dtype=np.uint8, mode='r')
+    assert bytes(buf[:len(_MAGIC)]) == _MAGIC, f'{path} is not a model file.'
+    (length,) = struct.unpack('=Q', bytes(buf[len(_MAGIC):len(_MAGIC) + 8]))
+    header = json.loads(bytes(buf[len(_MAGIC) + 8:len(_MAGIC) + 8 + length]))
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        nbytes = int(np.prod(spec['shape'])) * dtype.itemsize
+        arrays[name] = buf[spec['offset']:spec['offset'] + nbytes].view(dtype).reshape(spec['shape'])
+
+    offsets = arrays.pop('tree_offsets')
+    trees = [
+        FlatTree.from_arrays(header['cols'], header['classes'], **{name: arr[a:b] for name, arr in arrays.items()})
+        for a, b in zip(offsets[:-1], offsets[1:])
+    ]
+    return FlatForest(trees, header['cols'], header['classes'], voting=header['voting'])
+
+if __name__ == '__main__':
+
+    import os
+    import pickle
+    import tempfile
+    import time
+    from random_forest import RandomForest
+    from benchmark import make_data
+
+    df = make_data(20000, n_cols=8, noise=0.1)
+    forest = RandomForest(n_estimators=20, max_bins=255, random_state=0)
+    forest.train(df, gt_col='gt')
+    forest.compile()
+
+    folder = tempfile.mkdtemp()
+    pkl, bin_ = os.path.join(folder, 'forest.pkl'), os.path.join(folder, 'forest.aud')
+
+    start = time.perf_counter()
+    with open(pkl, 'wb') as f:
+        pickle.dump(forest.trees, f)
+    pickle_save = time.perf_counter() - start
+    start = time.perf_counter()
+    with open(pkl, 'rb') as f:
+        pickle.load(f)
+    pickle_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    save_model(bin_, forest)
+    model_save = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded = load_model(bin_)
+    model_load = time.perf_counter() - start
+
+    assert (loaded.predict_batch(df) == forest.predict_batch(df)).all()
+    print(f'{"format":>8} {"size[MB]":>9} {"save[s]":>8} {"load[s]":>8}')
+    print(f'{"pickle":>8} {os.path.getsize(pkl) / 1e6:>9.2f} {pickle_save:>8.3f} {pickle_load:>8.3f}')
+    print(f'{"model":>8} {os.path.getsize(bin_) / 1e6:>9.2f} {model_save:>8.3f} {model_load:>8.4f}')
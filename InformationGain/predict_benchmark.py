@@ -0,0 +1,35 @@
+import sys
+import time
+import numpy as np
+from random_tree import random_tree
+from random_forest import RandomForest
+from benchmark import make_data
+
+def rows_per_sec(fct, df):
+    start = time.perf_counter()
+    fct(df)
+    return len(df) / (time.perf_counter() - start)
+
+if __name__ == '__main__':
+
+    n_score = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    n_single = 5000 # row-by-row prediction is only timed on a few rows
+
+    train = make_data(20000, n_cols=8, noise=0.1, seed=0)
+    score = make_data(n_score, n_cols=8, noise=0.1, seed=1)
+
+    np.random.seed(0)
+    tree = random_tree(max_bins=255)
+    tree.train(train, gt_col='gt')
+    tree.compile()
+
+    forest = RandomForest(n_estimators=10, max_bins=255, random_state=0)
+    forest.train(train, gt_col='gt')
+    forest.compile()
+
+    print(f'scoring {n_score} rows; rows/sec')
+    print(f'{"model":>8} {"predict":>12} {"predict_batch":>14}')
+    for name, model in (('tree', tree), ('forest', forest)):
+        single = rows_per_sec(lambda df: df.apply(model.predict, axis=1), score.iloc[:n_single])
+        batch = rows_per_sec(model.predict_batch, score)
+        print(f'{name:>8} {single:>12.0f} {batch:>14.0f}')
@@ -0,0 +1,177 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from random_tree import random_tree
+from flat_tree import FlatForest
+
+# arrays of the training set within a worker process, attached once per process
+_shared = {}
+
+def _share(arr):
+    """
+    Copies `arr` into a new shared memory block; returns the block and what a worker needs to attach to it.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+def _attach(X_spec, y_spec):
+    # pool initializer: maps the training set of the parent process, without copying it
+    for key, (name, shape, dtype) in (('X', X_spec), ('y', y_spec)):
+        shm = shared_memory.SharedMemory(name=name)
+        _shared[key + '_shm'] = shm
+        _shared[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+def _train_tree(seed, cols, classes, params, bootstrap):
+    """
+    Trains one tree on the shared training set.
+    The tree is fully determined by `seed`: it draws the bootstrap sample and the sampled columns.
+    """
+    np.random.seed(seed)
+    X, y = _shared['X'], _shared['y']
+    rows = np.random.randint(0, len(y), len(y)) if bootstrap else None
+    tree = random_tree(**params)
+    tree.train_arrays(X, y, cols, classes, rows=rows)
+    return tree
+
+class RandomForest():
+    """
+    Ensemble of decorrelated `random_tree`s, trained in parallel on a process pool.
+
+    Decorrelation comes from bootstrap samples of the rows and from sampling
+    `samplecols` columns at each node. The training matrix is placed in shared memory
+    once, so it is not pickled to every worker. Each tree gets its own seed, derived from
+    `random_state`, thus results are reproducible independent of the number of workers.
+
+    Input:
+    n_estimators: int
+        number of trees
+    bootstrap: bool
+        if True, each tree is trained on n rows drawn with replacement
+    samplecols: Union(str,int,list)
+        columns to search over at each node; see `find_split`
+    max_bins: int or None
+        see `random_tree`
+    n_jobs: int or None
+        number of worker processes; None for all CPU cores, 1 to train in this process
+    random_state: int or None
+        seed of the ensemble
+    voting: str
+        'hard': predict the majority vote of the trees,
+        'soft': predict the class with the highest averaged probability of the trees
+    """
+
+    def __init__(self, n_estimators=10, bootstrap=True, samplecols='sqrt', max_bins=None, n_jobs=None, random_state=None, voting='hard', verbose=False):
+
+        self.n_estimators = n_estimators
+        self.bootstrap = bootstrap
+        self.samplecols = samplecols
+        self.max_bins = max_bins
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        assert voting in ('hard', 'soft'), f'voting needs to be "hard" or "soft", but is {voting}'
+        self.voting = voting
+        self.verbose = verbose
+
+        self.trees = []
+        self.istrained = False
+        self.flat = None
+
+    def __str__(self):
+        return f'RandomForest with {len(self.trees)} trees, trained: {self.istrained}.\n'
+
+    def train(self, df, gt_col):
+
+        cols = [c for c in df.keys() if c != gt_col]
+        X = df[cols].to_numpy()
+        assert X.dtype != object, f'Features need to be numeric to be shared with the workers, but are {X.dtype}'
+        y, classes = pd.factorize(df[gt_col], sort=True)
+
+        seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(self.random_state).spawn(self.n_estimators)]
+        params = dict(samplecols=self.samplecols, max_bins=self.max_bins)
+
+        if self.n_jobs == 1:
+            _shared.update(X=X, y=y)
+            try:
+                self.trees = [_train_tree(s, cols, classes, params, self.bootstrap) for s in seeds]
+            finally:
+                _shared.clear()
+        else:
+            X_shm, X_spec = _share(X)
+            y_shm, y_spec = _share(y)
+            try:
+                workers = self.n_jobs or os.cpu_count()
+                with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(X_spec, y_spec)) as pool:
+                    futures = [pool.submit(_train_tree, s, cols, classes, params, self.bootstrap) for s in seeds]
+                    self.trees = [f.result() for f in futures]
+            finally:
+                for shm in (X_shm, y_shm):
+                    shm.close()
+                    shm.unlink()
+
+        if self.verbose:
+            print(f'Trained {len(self.trees)} trees.')
+        self.cols = cols
+        self.classes = classes
+        self.istrained = True
+        self.flat = None
+
+    def predict(self, sample: pd.Series):
+        """
+        Majority vote of all trees, or the most probable class if `voting` is 'soft';
+        ties are broken towards the smallest class.
+        """
+        assert self.istrained, f'Forest not trained, thus can not make a prediction'
+        if self.voting == 'soft':
+            return self.predict_proba(sample).idxmax()
+        votes = Counter(t.predict(sample) for t in self.trees)
+        return min(votes, key=lambda c: (-votes[c], c))
+
+    def compile(self):
+        """
+        Flattens all trees into arrays over the same columns and classes, see `FlatForest`.
+        """
+        trees = [t.compile(classes=self.classes, cols=self.cols) for t in self.trees]
+        self.flat = FlatForest(trees, self.cols, self.classes, voting=self.voting)
+        return self.flat
+
+    def predict_batch(self, df):
+        """
+        `predict` for all rows of df at once; returns a pd.Series with the index of df.
+        """
+        assert self.istrained, f'Forest not trained, thus can not make a prediction'
+        if self.flat is None:
+            self.compile()
+        return self.flat.predict_batch(df)
+
+    def predict_proba(self, sample: pd.Series):
+        """
+        Class distributions of the leaves of `sample`, averaged over all trees, as pd.Series indexed by class.
+        """
+        assert self.istrained, f'Forest not trained, thus can not make a prediction'
+        return sum(t.predict_proba(sample) for t in self.trees) / len(self.trees)
+
+    def predict_proba_batch(self, df):
+        """
+        `predict_proba` for all rows of df at once; returns a pd.DataFrame with one column per class.
+        """
+        assert self.istrained, f'Forest not trained, thus can not make a prediction'
+        if self.flat is None:
+            self.compile()
+        return self.flat.predict_proba_batch(df)
+
+if __name__ == '__main__':
+
+    from benchmark import make_data
+
+    df = make_data(2000, n_cols=6, noise=0.1)
+    train, test = df.iloc[:1500], df.iloc[1500:]
+
+    forest = RandomForest(n_estimators=8, random_state=0)
+    forest.train(train, gt_col='gt')
+    print(forest)
+    print('test accuracy:', (test.apply(forest.predict, axis=1) == test['gt']).mean())
+    print(forest.predict_proba(test.iloc[0]))
@@ -1,21 +1,78 @@
-from informationgain import find_split, split
+from informationgain import find_split_arrays, _define_mumber_of_samples
+from histogram import quantize, histograms, best_bin_splits
+from flat_tree import FlatTree
+from growth_stats import GrowthStats
+import time
+import numpy as np
 import pandas as pd
 
+def _partition(rows, start, end, is_low):
+    """
+    Reorders rows[start:end] such that the samples where `is_low` holds come first,
+    like the partitioning step of quicksort.
+    Returns the position where the high samples start.
+    """
+    seg = rows[start:end]
+    rows[start:end] = np.concatenate((seg[is_low], seg[~is_low]))
+    return start + np.count_nonzero(is_low)
+
+class _TrainingSet():
+    """
+    Data shared by all nodes while a tree grows: a single feature matrix, the class codes
+    and one array of row indices. Every node owns the contiguous range rows[start:end],
+    which is partitioned in place for its children; thus no per-node copies of the data are made.
+    """
+
+    def __init__(self, X, y, cols, classes, rows=None, stats=None):
+        self.X = X
+        self.y = y
+        self.cols = list(cols)
+        self.classes = classes
+        self.rows = np.arange(len(y)) if rows is None else np.array(rows)
+        self.stats = GrowthStats() if stats is None else stats
+
+    @classmethod
+    def from_frame(cls, df, gt_col, stats=None):
+        cols = [c for c in df.keys() if c != gt_col]
+        y, classes = pd.factorize(df[gt_col], sort=True)
+        return cls(df[cols].to_numpy(), y, cols, classes, stats=stats)
+
+    def quantize(self, max_bins):
+        tic = time.perf_counter()
+        quantized = [quantize(self.X[:, j], max_bins) for j in range(len(self.cols))]
+        self.codes = np.column_stack([q[0] for q in quantized])
+        self.edges = [q[1] for q in quantized]
+        self.n_bins = max(len(e) for e in self.edges) + 1
+        self.stats.quantize_time += time.perf_counter() - tic
+
 class random_tree():
     """
     Grows a single, fully-gown decision tree on data in df.
     Splits are performed on information gain.
+
+    Input:
+    samplecols: Union(str,int,list)
+        columns to search over at each node; see `find_split`
+    max_bins: int or None
+        if None, every unique value of a column is tested as threshold.
+        Else, each column is quantized once into at most `max_bins` (<= 256) bins before
+        the tree is grown, and splits are searched on per-bin class histograms.
+
+    After training, `stats` holds the `GrowthStats` of the tree, i.e. where the time went.
     """
 
-    def __init__(self, samplecols='sqrt', verbose=False):
+    def __init__(self, samplecols='sqrt', verbose=False, max_bins=None):
 
         self.samplecols=samplecols
         self.verbose = verbose
+        self.max_bins = max_bins
 
         self.left = None
         self.right = None
         self.split_col = None
         self.istrained = False
+        self.flat = None
+        self.stats = None
 
     def __str__(self):
         s = f'id: {id(self)},\n'
@@ -24,33 +81,165 @@ class random_tree():
         s += f'has left: {self.left is not None}, has right: {self.right is not None}.\n'
         return s
 
-    def train(self, df, gt_col):
+    def _child(self):
+        return random_tree(samplecols=self.samplecols, verbose=self.verbose, max_bins=self.max_bins)
+
+    def train(self, df, gt_col, stats=None):
+        """
+        Input:
+        stats: GrowthStats or None
+            collects statistics while the tree grows, e.g. to trace every node or to
+            pass a callback; if None, only the aggregates are collected
+        """
+        self._train(_TrainingSet.from_frame(df, gt_col, stats=stats))
+
+    def train_arrays(self, X, y, cols, classes, rows=None, stats=None):
+        """
+        Trains on a feature matrix instead of a DataFrame.
+
+        Input:
+        X: np.ndarray
+            features, shape (n, d); column j holds the feature named cols[j]
+        y: np.ndarray
+            class codes, i.e. indices into `classes`, shape (n,)
+        rows: np.ndarray or None
+            samples to train on; may contain repetitions, e.g., for a bootstrap sample.
+            All samples if None.
+        stats: GrowthStats or None
+            see `train`
+        """
+        self._train(_TrainingSet(X, y, cols, classes, rows, stats=stats))
+
+    def _train(self, data):
+        self.flat = None
+        self.stats = data.stats
+        tic = time.perf_counter()
 
+        if self.max_bins is None:
+            self._grow(data, 0, len(data.rows))
+        else:
+            data.quantize(self.max_bins)
+            tic_hists = time.perf_counter()
+            hists = histograms(data.codes, data.y, data.rows, data.n_bins, len(data.classes))
+            self.stats.hist_time += time.perf_counter() - tic_hists
+            self._grow_binned(data, 0, len(data.rows), hists)
+
+        self.stats.total_time += time.perf_counter() - tic
+
+    def _set_mode(self, counts, classes):
         self.istrained=True
-        self.mode_class = df[gt_col].mode()
-        self.mode_prior = df[gt_col].value_counts()[0]/len(df)
+        self.classes = classes # shared by all nodes of the tree
+        self.class_counts = counts.astype(np.int32) # training samples per class in this node
+        self.mode_class = pd.Series([classes[np.argmax(counts)]]) # ties: smallest class, as in `pd.Series.mode`
+        self.mode_prior = counts.max()/counts.sum()
 
-        #import pudb; pudb.set_trace()
+    def _grow(self, data, start, end, depth=0):
+        """
+        Grows the tree on the samples data.rows[start:end], testing every unique value as threshold.
+        """
+        seg = data.rows[start:end]
+        counts = np.bincount(data.y[seg], minlength=len(data.classes))
+        self._set_mode(counts, data.classes)
 
-        if df[gt_col].nunique() == 1: return # pure leaf, i.e., all samples of the same class
+        if np.count_nonzero(counts) == 1: # pure leaf, i.e., all samples of the same class
+            data.stats.record(depth, end - start)
+            return
 
-        self.split_col, self.split_val, _ = find_split(df, gt_col=gt_col, samplecols=self.samplecols, samplevals='all', verbose=self.verbose)
+        evaluated = []
+        tic = time.perf_counter()
+        self.split_col, self.split_val, igs = find_split_arrays(data.X, data.y, data.cols, samplecols=self.samplecols, samplevals='all', verbose=self.verbose, rows=seg, evaluated=evaluated)
+        split_time = time.perf_counter() - tic
         if self.split_col is None:
+            data.stats.record(depth, end - start, sum(evaluated), split_time=split_time)
             if self.verbose:
                 # this is opposed to the sklearn implementation;
                 # there it says, if no split within selected cols is found, search continues
                 # over remaining columns. See documentaion: `max_features`
-                print(f'Could not find a split; although leaf is not pure: {df[gt_col].value_counts()}')
+                print(f'Could not find a split; although leaf is not pure: {counts}')
+            return
 
-            self.mode_class = df[gt_col].mode()
+        tic = time.perf_counter()
+        is_low = data.X[seg, data.cols.index(self.split_col)] <= self.split_val
+        mid = _partition(data.rows, start, end, is_low)
+        data.stats.record(depth, end - start, sum(evaluated), igs[self.split_col][1], split_time, time.perf_counter() - tic)
+        assert start < mid, f'low of len 0'
+        assert mid < end, f'high of len 0'
+
+        self.left = self._child()
+        self.left._grow(data, start, mid, depth + 1)
+        self.right = self._child()
+        self.right._grow(data, mid, end, depth + 1)
+
+    def _grow_binned(self, data, start, end, hists, depth=0):
+        """
+        Grows the tree on the quantized samples data.rows[start:end],
+        whose class histograms per feature and bin are `hists`.
+        """
+        counts = hists[0].sum(axis=0)
+        self._set_mode(counts, data.classes)
+
+        if np.count_nonzero(counts) == 1: # pure leaf, i.e., all samples of the same class
+            data.stats.record(depth, end - start)
+            return
+
+        tic = time.perf_counter()
+        cols = data.cols
+        if isinstance(self.samplecols, list):
+            sampled = np.array([cols.index(c) for c in self.samplecols])
+        else:
+            num_samplecols = _define_mumber_of_samples(method=self.samplecols, max_samples=len(cols))
+            sampled = np.random.choice(len(cols), num_samplecols, replace=False)
+        if self.verbose:
+            print(f' Sample from cols {[cols[f] for f in sampled]}')
+
+        bins, igs = best_bin_splits(hists[sampled])
+        best = np.argmax(igs)
+        split_time = time.perf_counter() - tic
+        thresholds = len(sampled) * (data.n_bins - 1)
+        if igs[best] == -1 * np.inf:
+            data.stats.record(depth, end - start, thresholds, split_time=split_time)
+            if self.verbose:
+                print(f'Could not find a split; although leaf is not pure: {counts}')
             return
 
-        df_low, df_high = split(df, self.split_col, self.split_val)
-        assert len(df_low) > 0, f'low of len 0'
-        assert len(df_high) > 0, f'high of len 0'
+        f, b = sampled[best], bins[best]
+        self.split_col = cols[f]
+        self.split_val = data.edges[f][b]
+
+        tic = time.perf_counter()
+        is_low = data.codes[data.rows[start:end], f] <= b
+        mid = _partition(data.rows, start, end, is_low)
+        partition_time = time.perf_counter() - tic
+
+        # histograms are only counted for the smaller child; the larger one is the difference to the parent
+        if mid - start <= end - mid:
+            low_hists = histograms(data.codes, data.y, data.rows[start:mid], data.n_bins, len(data.classes))
+            high_hists = hists - low_hists
+        else:
+            high_hists = histograms(data.codes, data.y, data.rows[mid:end], data.n_bins, len(data.classes))
+            low_hists = hists - high_hists
+        data.stats.record(depth, end - start, thresholds, igs[best], split_time, partition_time, time.perf_counter() - tic - partition_time)
+
+        self.left = self._child()
+        self.left._grow_binned(data, start, mid, low_hists, depth + 1)
+        self.right = self._child()
+        self.right._grow_binned(data, mid, end, high_hists, depth + 1)
 
-        self.left = random_tree().train(df=df_low, gt_col=gt_col)
-        self.right = random_tree().train(df=df_high, gt_col=gt_col)
+    def compile(self, classes=None, cols=None):
+        """
+        Flattens the trained tree into parallel arrays (see `FlatTree`), which are used by `predict_batch`.
+        """
+        self.flat = FlatTree(self, classes=classes, cols=cols)
+        return self.flat
+
+    def predict_batch(self, df):
+        """
+        Predicts all rows of df at once; returns a pd.Series with the index of df.
+        """
+        assert self.istrained, f'Tree not trained, thus can not make a prediction'
+        if self.flat is None:
+            self.compile()
+        return self.flat.predict_batch(df)
 
     def predict(self, sample: pd.Series):
 
@@ -62,6 +251,27 @@ class random_tree():
             return self.left.predict(sample)
         return self.right.predict(sample)
 
+    def predict_proba(self, sample: pd.Series):
+        """
+        Class distribution of the training samples in the leaf of `sample`, as pd.Series indexed by class.
+        """
+        assert self.istrained, f'Tree not trained, thus can not make a prediction'
+
+        if self.left is None: # already in a leaf
+            return pd.Series(self.class_counts/self.class_counts.sum(), index=self.classes)
+        if sample[self.split_col] <= self.split_val:
+            return self.left.predict_proba(sample)
+        return self.right.predict_proba(sample)
+
+    def predict_proba_batch(self, df):
+        """
+        `predict_proba` for all rows of df at once; returns a pd.DataFrame with one column per class.
+        """
+        assert self.istrained, f'Tree not trained, thus can not make a prediction'
+        if self.flat is None:
+            self.compile()
+        return self.flat.predict_proba_batch(df)
+
 if __name__ == '__main__':
 
     df = pd.DataFrame(
@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+from informationgain import entropy, _entropy_rows
+from histogram import quantize, best_bin_splits
+
+def read_parquet_chunks(path, columns=None):
+    """
+    Yields the row groups of a Parquet file one at a time as pd.DataFrame.
+    Requires pyarrow.
+    """
+    import pyarrow.parquet as pq
+    pf = pq.ParquetFile(path)
+    for i in range(pf.num_row_groups):
+        yield pf.read_row_group(i, columns=columns).to_pandas()
+
+class ContingencyCounts():
+    """
+    Feature-vs-class contingency counts, accumulated chunk by chunk.
+
+    Each feature is quantized into bins (see `quantize`), and for every feature the number
+    of samples per (bin, class) is counted. These counts are all that entropy, mutual
+    information and the best split `x <= edge` need, thus a dataset that does not fit in
+    memory is processed in a single pass, e.g. over `pd.read_csv(..., chunksize=...)` or
+    `read_parquet_chunks`. Counts of different workers are added with `merge`.
+
+    Input:
+    gt_col: str
+        class column
+    features: list or None
+        feature columns; if None, all columns of the first chunk except `gt_col`
+    edges: dict or None
+        upper bin edges per feature, as returned by `quantize`; features without edges
+        get the quantiles of the first chunk, with at most `max_bins` bins.
+        Counters that are merged need to use the same edges.
+    max_bins: int
+
+    Remarks:
+    - Samples with a missing class, or a missing value of a feature, are not counted (for that feature).
+    - Classes are added as they appear in the stream.
+    """
+
+    def __init__(self, gt_col, features=None, edges=None, max_bins=255):
+
+        self.gt_col = gt_col
+        self.features = None if features is None else list(features)
+        self.edges = dict(edges or {})
+        self.max_bins = max_bins
+
+        self.classes = []
+        self._class_index = {}
+        self.class_counts = np.zeros(0, dtype=np.int64)
+        self.counts = {} # feature -> np.ndarray of shape (n_bins, n_classes)
+        self.n_chunks = 0
+
+    def __str__(self):
+        return f'ContingencyCounts over {len(self.counts)} features and {len(self.classes)} classes of {self.class_counts.sum()} samples.\n'
+
+    def _add_classes(self, labels):
+        """
+        Indices of `labels` into `classes`; unknown labels are appended, and all counts widened.
+        """
+        for l in labels:
+            if l not in self._class_index:
+                self._class_index[l] = len(self.classes)
+                self.classes.append(l)
+        grow = len(self.classes) - len(self.class_counts)
+        if grow:
+            self.class_counts = np.pad(self.class_counts, (0, grow))
+            for f, c in self.counts.items():
+                self.counts[f] = np.pad(c, ((0, 0), (0, grow)))
+        return np.array([self._class_index[l] for l in labels], dtype=np.int64)
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Adds the samples of `chunk` to the counts; returns self.
+        """
+        if self.features is None:
+            self.features = [c for c in chunk.keys() if c != self.gt_col]
+
+        codes, labels = pd.factorize(chunk[self.gt_col])
+        known = codes >= 0
+        y = self._add_classes(list(labels))[codes[known]]
+        k = len(self.classes)
+        self.class_counts += np.bincount(y, minlength=k)
+
+        for f in self.features:
+            x = chunk[f].to_numpy()[known]
+            if f not in self.edges:
+                self.edges[f] = quantize(x[~pd.isna(x)], self.max_bins)[1]
+            if f not in self.counts:
+                self.counts[f] = np.zeros((len(self.edges[f]) + 1, k), dtype=np.int64)
+
+            valid = ~pd.isna(x)
+            bins = np.searchsorted(self.edges[f], x[valid], side='left')
+            idx = bins * k + y[valid]
+            self.counts[f] += np.bincount(idx, minlength=self.counts[f].size).reshape(self.counts[f].shape)
+
+        self.n_chunks += 1
+        return self
+
+    @classmethod
+    def from_chunks(cls, chunks, gt_col, **kwargs):
+        """
+        Consumes an iterable of pd.DataFrames, e.g. `pd.read_csv(path, chunksize=10**6)`.
+        For `kwargs`, see `ContingencyCounts`.
+        """
+        acc = cls(gt_col, **kwargs)
+        for chunk in chunks:
+            acc.update(chunk)
+        return acc
+
+    def merge(self, other):
+        """
+        Adds the counts of `other`, e.g. of another worker that processed different chunks; returns self.
+        Both need the same bin edges for the features they share.
+        """
+        if self.features is None:
+            self.features = other.features
+        index = self._add_classes(other.classes)
+        self.class_counts[index] += other.class_counts
+
+        k = len(self.classes)
+        for f, c in other.counts.items():
+            if f in self.counts:
+                assert np.array_equal(self.edges[f], other.edges[f]), f'Bin edges of feature {f} differ, thus the counts can not be merged.'
+            else:
+                self.edges[f] = other.edges[f]
+                self.counts[f] = np.zeros((len(other.edges[f]) + 1, k), dtype=np.int64)
+            self.counts[f][:, index] += c
+
+        self.n_chunks += other.n_chunks
+        return self
+
+    def priors(self):
+        """
+        Prior probabilities of the classes, as pd.Series indexed by class; see `get_priors`.
+        """
+        return pd.Series(self.class_counts / self.class_counts.sum(), index=self.classes)
+
+    def entropy(self):
+        """
+        Entropy of the class distribution, in [bits].
+        """
+        return entropy(probs=self.priors())
+
+    def mutual_information(self):
+        """
+        Mutual information between each quantized feature and the class, in [bits];
+        i.e. the information gain of splitting on every bin at once.
+
+        Return:
+        pd.Series indexed by feature
+        """
+        mi = {}
+        for f, c in self.counts.items():
+            n_bin = c.sum(axis=1)
+            n = n_bin.sum()
+            if n == 0:
+                mi[f] = 0.0
+                continue
+            h_y = _entropy_rows(c.sum(axis=0)[np.newaxis, :].astype(float))[0]
+            h_y_given_x = (n_bin / n * _entropy_rows(c.astype(float))).sum()
+            mi[f] = h_y - h_y_given_x
+        return pd.Series(mi)
+
+    def best_splits(self):
+        """
+        Best split `x <= val` of each feature, with `val` among the bin edges.
+
+        Return:
+        dict with the features as key and their best split as tuple (value_to_split_on, ig),
+        as the information gains of `find_split`; features that can not be split are left out.
+        """
+        splits = {}
+        for f, c in self.counts.items():
+            if len(c) < 2:
+                continue
+            bins, igs = best_bin_splits(c[np.newaxis])
+            if np.isfinite(igs[0]):
+                splits[f] = (self.edges[f][bins[0]], igs[0])
+        return splits
+
+if __name__ == '__main__':
+
+    import os
+    import tempfile
+    from benchmark import make_data
+    from histogram import histograms
+
+    df = make_data(200000, n_cols=4, noise=0.2)
+    path = os.path.join(tempfile.mkdtemp(), 'data.csv')
+    df.to_csv(path, index=False)
+
+    # the edges are fixed up front, thus each worker can count its own chunks
+    edges = {f: quantize(df[f].to_numpy(), 32)[1] for f in df.keys() if f != 'gt'}
+    acc = ContingencyCounts('gt', edges=edges)
+    for chunk in pd.read_csv(path, chunksize=20000):
+        part = ContingencyCounts('gt', edges=edges).update(chunk)
+        acc.merge(part)
+    print(acc)
+    print('class entropy:', acc.entropy())
+    print('mutual information:')
+    print(acc.mutual_information())
+    print('best splits:', acc.best_splits())
+
+    # same counts as histograms over the whole frame in memory
+    cols = list(edges)
+    codes = np.stack([np.searchsorted(edges[f], df[f], side='left') for f in cols], axis=1)
+    y, classes = pd.factorize(df['gt'], sort=True)
+    n_bins = max(len(e) for e in edges.values()) + 1
+    hists = histograms(codes, y, np.arange(len(df)), n_bins, len(classes))
+    order = [acc.classes.index(c) for c in classes]
+    for j, f in enumerate(cols):
+        assert np.array_equal(hists[j, :len(edges[f]) + 1], acc.counts[f][:, order])
+    print('counts match the in-memory histograms')
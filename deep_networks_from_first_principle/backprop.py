@@ -1,5 +1,6 @@
 import numpy as np
 from tqdm import tqdm
+from optimizers import sgd, momentum, adam
 
 debug_w0 = np.array([[0.13436424411240122, 0.8474337369372327]])
 debug_b0 = np.array([[0.763774618976614]])
@@ -12,16 +13,110 @@ debug_b1 = np.array([[0.49543508709194095],
             ])
 
 class sigmoid():
+    """
+    Logistic function, computed with NumPy ufuncs on whole arrays.
+    Both methods write into `out` if given, e.g. a preallocated buffer; `out` may be the input itself.
+    """
 
-    def __init__(self):
-        self.fct = np.vectorize(lambda x: 1 / ( 1 + np.exp(-x)))
+    def activate(self, input_data, out=None):
+        # equiv. to 1 / (1 + exp(-x)), but without overflow of exp for large negative x
+        out = np.multiply(input_data, 0.5, out=out)
+        np.tanh(out, out=out)
+        out += 1
+        out *= 0.5
+        return out
 
-    def activate(self, input_data):
-        return self.fct(input_data)
+    def derivative(self, x, out=None):
+        # equiv. to: sig(x)/dx = sig(x) * (1 - sig(x)); x is the output of `activate`
+        out = np.subtract(1.0, x, out=out)
+        out *= x
+        return out
 
-    def derivative(self, x):
-        # equiv. to: sig(x)/dx = sig(x) * (1 - sig(x))
-        return x * (1.0 - x)
+class relu():
+    """
+    max(0, x); see `sigmoid` for `out`.
+    """
+
+    def activate(self, input_data, out=None):
+        return np.maximum(input_data, 0, out=out)
+
+    def derivative(self, x, out=None):
+        # 1 where the output is positive, else 0
+        return np.greater(x, 0, out=out)
+
+class tanh():
+    """
+    Hyperbolic tangent; see `sigmoid` for `out`.
+    """
+
+    def activate(self, input_data, out=None):
+        return np.tanh(input_data, out=out)
+
+    def derivative(self, x, out=None):
+        # tanh(x)/dx = 1 - tanh(x)**2
+        out = np.multiply(x, x, out=out)
+        np.subtract(1.0, out, out=out)
+        return out
+
+class softmax():
+    """
+    Normalizes each row to a probability distribution; see `sigmoid` for `out`.
+
+    Only for the output layer together with `cross_entropy`, whose gradient w.r.t.
+    the input of the softmax is computed directly (see `cross_entropy`).
+    """
+
+    def activate(self, input_data, out=None):
+        # subtracting the maximum of each row keeps exp from overflowing, without changing the result
+        out = np.subtract(input_data, input_data.max(axis=1, keepdims=True), out=out)
+        np.exp(out, out=out)
+        out /= out.sum(axis=1, keepdims=True)
+        return out
+
+    def derivative(self, x, out=None):
+        raise ValueError('The derivative of softmax is a matrix per sample; use softmax only as output layer with cross_entropy.')
+
+ACTIVATIONS = {'sigmoid': sigmoid, 'relu': relu, 'tanh': tanh, 'softmax': softmax}
+
+class squared_error():
+    """
+    0.5 * (y_true - y_pred)**2, summed over the outputs and averaged over the samples.
+    Calling the loss returns its negative gradient w.r.t. y_pred, as `loss_fct` of `model`.
+    """
+
+    def __call__(self, y_true, y_pred):
+        return y_true - y_pred
+
+    def value(self, y_true, y_pred):
+        return 0.5 * np.sum((y_true - y_pred)**2) / len(y_true)
+
+class cross_entropy():
+    """
+    -sum(y_true * log(y_pred)) over the classes, averaged over the samples; y_true is one-hot (or a distribution).
+
+    After a `softmax` output layer, the negative gradient w.r.t. the input of the softmax
+    is just y_true - y_pred; `model` uses it directly (`fused_activation`), thus neither the
+    softmax Jacobian nor a division by small probabilities is needed.
+    """
+
+    fused_activation = softmax
+    tiny = np.finfo(float).tiny
+
+    def __call__(self, y_true, y_pred):
+        return y_true / np.maximum(y_pred, self.tiny)
+
+    def fused(self, y_true, y_pred):
+        return y_true - y_pred
+
+    def value(self, y_true, y_pred):
+        return -np.sum(y_true * np.log(np.maximum(y_pred, self.tiny))) / len(y_true)
+
+LOSSES = {'squared_error': squared_error, 'cross_entropy': cross_entropy}
+OPTIMIZERS = {'sgd': sgd, 'momentum': momentum, 'adam': adam}
+
+def _get(kind, registry):
+    # instance from a name of `registry`; other objects are returned as they are
+    return registry[kind]() if isinstance(kind, str) else kind
 
 class fully_connected_layer():
 
@@ -42,18 +137,93 @@ class fully_connected_layer():
         s += str(self.err)
         return s
 
-    def __init__(self, input_len, output_len):
-        self.weights = np.array([np.random.rand(input_len) for _ in range(output_len)]).T
-        self.biases = np.array([np.random.rand(1) for _ in range(output_len)]).T
+    def __init__(self, input_len, output_len, activation='sigmoid', init='uniform'):
+        """
+        Input:
+        activation: str or object
+            name of `ACTIVATIONS`, or an object with `activate` and `derivative`
+        init: str
+            'uniform': weights and biases \in [0|1),
+            'he': weights ~ N(0, 2 / input_len), for relu,
+            'xavier': weights ~ N(0, 1 / input_len), for tanh and sigmoid;
+            biases are 0 for 'he' and 'xavier'
+        """
+        if init == 'uniform':
+            # same random numbers as drawing one row of weights and one bias per output
+            self.weights = np.ascontiguousarray(np.random.rand(output_len, input_len).T)
+            self.biases = np.random.rand(1, output_len)
+        else:
+            assert init in ('he', 'xavier'), f'init needs to be "uniform", "he" or "xavier", but is {init}'
+            scale = np.sqrt((2. if init == 'he' else 1.) / input_len)
+            self.weights = np.random.randn(input_len, output_len) * scale
+            self.biases = np.zeros((1, output_len))
 
-        self.activation = sigmoid()
+        self.activation = _get(activation, ACTIVATIONS)
 
-    def predict(self, input_data):
-        res = np.matmul(input_data, self.weights) + self.biases
-        res = self.activation.activate(res)
+        # gradients of the loss, and buffers for a batch of up to `_capacity` samples; reused by every step
+        self.grad_weights = np.zeros_like(self.weights)
+        self.grad_biases = np.zeros_like(self.biases)
+        self._capacity = 0
+
+    def _allocate(self, m):
+        if m > self._capacity:
+            input_len, output_len = self.weights.shape
+            self._y_pred = np.empty((m, output_len))
+            self._deltas = np.empty((m, output_len))
+            self._err_in = np.empty((m, input_len))
+            self._capacity = m
+
+    def forward(self, input_data):
+        """
+        Output of the layer for a batch, shape (m, output_len).
+        Written into a buffer of the layer, thus only valid until the next call.
+        """
+        m = len(input_data)
+        self._allocate(m)
+        res = self._y_pred[:m]
+        np.matmul(input_data, self.weights, out=res)
+        res += self.biases
+        self.activation.activate(res, out=res)
         self.y_pred = res
         return res
 
+    def backward(self, input_data, err, fused=False):
+        """
+        Computes the gradients of the loss for the batch `input_data` the layer was last run on.
+
+        Input:
+        err: np.ndarray
+            negative gradient of the loss w.r.t. the output of this layer, shape (m, output_len)
+        fused: bool
+            if True, `err` is already the negative gradient w.r.t. the input of the activation
+
+        Return:
+        np.ndarray
+            negative gradient of the loss w.r.t. `input_data`, i.e. `err` of the previous layer;
+            written into a buffer of the layer
+        """
+        m = len(err)
+        deltas = self._deltas[:m]
+        if fused:
+            np.copyto(deltas, err)
+        else:
+            self.activation.derivative(self.y_pred, out=deltas)
+            deltas *= err
+        self.err = err
+        self.deltas = deltas
+
+        # mean over the batch; the minus turns the negative gradients into gradients
+        np.matmul(input_data.T, deltas, out=self.grad_weights)
+        self.grad_weights *= -1 / m
+        np.sum(deltas, axis=0, keepdims=True, out=self.grad_biases)
+        self.grad_biases *= -1 / m
+
+        # uses the weights before the update
+        return np.matmul(deltas, self.weights.T, out=self._err_in[:m])
+
+    def predict(self, input_data):
+        return self.forward(input_data).copy()
+
 class model():
 
     def __str__(self):
@@ -64,45 +234,111 @@ class model():
             s += '\n###################################\n'
         return s
 
-    def __init__(self,layers=[2,3,2,5,1,2], random_state=1, loss_fct=lambda y_true, y_pred: y_true - y_pred, learning_rate=.1):
+    def __init__(self,layers=[2,3,2,5,1,2], random_state=1, loss_fct=lambda y_true, y_pred: y_true - y_pred, learning_rate=.1,
+                 activation='sigmoid', output_activation=None, optimizer='sgd', init='uniform'):
+        """
+        Input:
+        layers: list
+            number of neurons per layer, starting with the input dimension
+        loss_fct: callable or str
+            negative gradient of the loss w.r.t. the prediction; the default belongs to the squared error 0.5 * (y_true - y_pred)**2.
+            Or a name of `LOSSES`, or a loss object such as `cross_entropy()`, which also provides `value`
+        activation: str or object
+            activation of the hidden layers, see `ACTIVATIONS`
+        output_activation: str, object or None
+            activation of the last layer; if None, the same as `activation`
+        optimizer: str or object
+            name of `OPTIMIZERS` (created with `learning_rate`), or an optimizer object, e.g. `adam(learning_rate=.01)`
+        init: str
+            initialization of the weights, see `fully_connected_layer`
+        """
         np.random.seed(random_state)
-        self.layers = [fully_connected_layer(input_len=i, output_len=j) for i,j in zip(layers[:-1], layers[1:])]
-        self.loss_fct = loss_fct
+        self.rng = np.random.default_rng(random_state) # shuffles the samples
+        activations = [activation] * (len(layers) - 2) + [activation if output_activation is None else output_activation]
+        self.layers = [fully_connected_layer(input_len=i, output_len=j, activation=a, init=init) for i, j, a in zip(layers[:-1], layers[1:], activations)]
+        self.loss_fct = _get(loss_fct, LOSSES)
+        self.learning_rate = learning_rate
+        self.optimizer = OPTIMIZERS[optimizer](learning_rate) if isinstance(optimizer, str) else optimizer
 
-    def predict(self,input_data):
+        # the gradient of the loss w.r.t. the input of the output activation is known in closed form
+        self._fused = isinstance(self.layers[-1].activation, getattr(self.loss_fct, 'fused_activation', ()))
+        assert not any(isinstance(l.activation, softmax) for l in self.layers[:-1]) and \
+            (self._fused or not isinstance(self.layers[-1].activation, softmax)), 'softmax is only supported as output activation with cross_entropy'
+
+        self._params = [p for l in self.layers for p in (l.weights, l.biases)]
+        self._grads = [g for l in self.layers for g in (l.grad_weights, l.grad_biases)]
+
+    def _forward(self, input_data):
+        self._input = input_data
         for i, l in enumerate(self.layers):
-            input_data = l.predict(input_data)
+            input_data = l.forward(input_data)
         return input_data
 
+    def predict(self,input_data):
+        return self._forward(input_data).copy()
+
     def loss(self, y_true, y_pred):
         return self.loss_fct(y_true, y_pred)
 
-    def _calc_updates(self, learning_rate, weight, delta, data):
-        import pudb; pudb.set_trace()
-        return weight + learning_rate * delta * data
-
-    def _update(self, data, learning_rate):
-        for i, l in enumerate(self.layers):
-            w_new = self._calc_updates(learning_rate, weight=l.weights, delta=l.deltas, data=data)
-            l.weights = w_new
-            data = l.y_pred
+    def evaluate(self, data, y_true):
+        """
+        Value of the loss on `data`; the squared error if the loss function provides no `value`.
+        """
+        y_pred = self._forward(np.asarray(data, dtype=float))
+        if hasattr(self.loss_fct, 'value'):
+            return self.loss_fct.value(y_true, y_pred)
+        return squared_error().value(y_true, y_pred)
 
     def _backprop(self, y_true, y_pred):
 
-        err = self.loss(y_true, y_pred)
+        err = self.loss_fct.fused(y_true, y_pred) if self._fused else self.loss(y_true, y_pred)
+
+        for i in range(len(self.layers) - 1, -1, -1):
+            input_data = self.layers[i - 1].y_pred if i > 0 else self._input
+            err = self.layers[i].backward(input_data, err, fused=self._fused and i == len(self.layers) - 1)
+
+    def _update(self, learning_rate):
+        # the parameters and gradients are the arrays of the layers, thus the optimizer updates those in place
+        self.optimizer.learning_rate = learning_rate
+        self.optimizer.step(self._params, self._grads)
+
+    def train_batch(self, data, y_true, learning_rate=None):
+        """
+        A single gradient descent step on one batch.
+        """
+        y_pred = self._forward(data)
+        self._backprop(y_true=y_true, y_pred=y_pred)
+        self._update(learning_rate=self.optimizer.learning_rate if learning_rate is None else learning_rate)
+
+    def train(self, data, y_true, epochs=10, learning_rate=None, batch_size=32, shuffle=True, verbose=True):
+        """
+        Mini-batch gradient descent over all samples, `epochs` times.
+
+        Each epoch visits the samples in a new random order (if `shuffle`). The samples of a
+        batch are gathered into buffers that are allocated once, like all buffers of the layers.
 
-        for i, l in enumerate(self.layers[::-1]):
-            derivatives = l.activation.derivative(l.y_pred)
-            deltas = err * derivatives
-            l.err = err
-            l.deltas = deltas
-            err = np.matmul(deltas,l.weights.T)
+        Input:
+        data: np.ndarray
+            samples, shape (n, layers[0])
+        y_true: np.ndarray
+            targets, shape (n, layers[-1])
+        learning_rate: float or None
+            if None, the learning rate of the optimizer
+        """
+        data = np.asarray(data, dtype=float)
+        y_true = np.asarray(y_true, dtype=float)
+        n = len(data)
+        batch_size = min(batch_size, n)
+        data_batch = np.empty((batch_size,) + data.shape[1:])
+        y_batch = np.empty((batch_size,) + y_true.shape[1:])
 
-    def train(self, data, y_true, epochs=10, learning_rate=.1):
-        for e in tqdm(range(epochs)):
-            y_pred = self.predict(data)
-            self._backprop(y_true=y_true, y_pred=y_pred)
-            self._update(data=data, learning_rate=learning_rate)
+        for e in tqdm(range(epochs), disable=not verbose):
+            order = self.rng.permutation(n) if shuffle else np.arange(n)
+            for start in range(0, n, batch_size):
+                idx = order[start:start + batch_size]
+                x = np.take(data, idx, axis=0, out=data_batch[:len(idx)], mode='clip')
+                y = np.take(y_true, idx, axis=0, out=y_batch[:len(idx)], mode='clip')
+                self.train_batch(x, y, learning_rate=learning_rate)
 
 if __name__ == '__main__':
 
@@ -132,4 +368,5 @@ if __name__ == '__main__':
 
     batch_size = 2
     p = m.predict(X[:batch_size,:])
-    m.train(X[:batch_size,:], y[:batch_size,:])
+    m.train(X, y, epochs=1000, learning_rate=1., batch_size=batch_size)
+    print(m.predict(X))
@@ -0,0 +1,49 @@
+import sys
+import time
+import numpy as np
+from backprop import model
+from optimizers import momentum, adam
+
+def make_spirals(n, n_classes=3, noise=0.1, seed=0):
+    """
+    `n_classes` interleaved spiral arms in 2d; targets are one-hot.
+    """
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, n_classes, n)
+    r = rng.random(n)
+    angle = labels * 2 * np.pi / n_classes + 4 * np.pi * r + rng.normal(scale=noise, size=n)
+    X = np.column_stack((r * np.cos(angle), r * np.sin(angle)))
+    return X, np.eye(n_classes)[labels], labels
+
+def accuracy(m, X, labels):
+    return np.mean(np.argmax(m.predict(X), axis=1) == labels)
+
+if __name__ == '__main__':
+
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 10. # seconds of training per configuration
+    target = .9
+    X, y, labels = make_spirals(4000)
+    X_test, y_test, labels_test = make_spirals(2000, seed=1)
+    layers = [2, 64, 64, 3]
+
+    configs = {
+        'sigmoid, mse, sgd': dict(),
+        'tanh, ce, sgd': dict(activation='tanh', output_activation='softmax', loss_fct='cross_entropy', init='xavier'),
+        'relu, ce, momentum': dict(activation='relu', output_activation='softmax', loss_fct='cross_entropy', init='he', optimizer=momentum(.05)),
+        'relu, ce, adam': dict(activation='relu', output_activation='softmax', loss_fct='cross_entropy', init='he', optimizer=adam(.005)),
+    }
+
+    print(f'{len(X)} training samples, {budget:.0f}s of training each; time to {target:.0%} test accuracy')
+    print(f'{"configuration":>20} {"epochs":>7} {"loss":>8} {"accuracy":>9} {f"to {target:.0%} [s]":>11}')
+    for name, params in configs.items():
+        m = model(layers=layers, random_state=0, learning_rate=.5, **params)
+        elapsed, epochs, reached = 0., 0, None
+        while elapsed < budget:
+            start = time.perf_counter()
+            m.train(X, y, epochs=1, batch_size=32, verbose=False)
+            elapsed += time.perf_counter() - start # evaluation is not timed
+            epochs += 1
+            if reached is None and accuracy(m, X_test, labels_test) >= target:
+                reached = elapsed
+        reached = f'{reached:.2f}' if reached is not None else '-'
+        print(f'{name:>20} {epochs:>7} {m.evaluate(X_test, y_test):>8.4f} {accuracy(m, X_test, labels_test):>9.3f} {reached:>11}')
@@ -0,0 +1,83 @@
+import numpy as np
+
+class sgd():
+    """
+    Plain gradient descent.
+
+    All optimizers update the parameters in place with `out=` arguments and use the
+    gradients as scratch space, thus a step allocates nothing; the gradients are consumed.
+    Their state (e.g. velocities) is allocated on the first step, per parameter.
+    """
+
+    def __init__(self, learning_rate=.1):
+        self.learning_rate = learning_rate
+
+    def step(self, params, grads):
+        """
+        Input:
+        params: list of np.ndarray
+            parameters, updated in place
+        grads: list of np.ndarray
+            gradients of the loss w.r.t. `params`, overwritten
+        """
+        for p, g in zip(params, grads):
+            np.multiply(g, self.learning_rate, out=g)
+            np.subtract(p, g, out=p)
+
+class momentum(sgd):
+    """
+    Gradient descent with momentum: v = beta * v + g, p = p - learning_rate * v.
+    """
+
+    def __init__(self, learning_rate=.1, beta=.9):
+        super().__init__(learning_rate)
+        self.beta = beta
+        self.velocities = None
+
+    def step(self, params, grads):
+        if self.velocities is None:
+            self.velocities = [np.zeros_like(p) for p in params]
+        for p, g, v in zip(params, grads, self.velocities):
+            np.multiply(v, self.beta, out=v)
+            np.add(v, g, out=v)
+            np.multiply(v, self.learning_rate, out=g)
+            np.subtract(p, g, out=p)
+
+class adam(sgd):
+    """
+    Adam (Kingma & Ba, 2015): steps along the bias-corrected running mean of the gradients,
+    scaled per parameter by the running root mean square of the gradients.
+    """
+
+    def __init__(self, learning_rate=.001, beta1=.9, beta2=.999, eps=1e-8):
+        super().__init__(learning_rate)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.t = 0
+        self.means = None
+        self.variances = None
+
+    def step(self, params, grads):
+        if self.means is None:
+            self.means = [np.zeros_like(p) for p in params]
+            self.variances = [np.zeros_like(p) for p in params]
+        self.t += 1
+        # bias correction of both moments, folded into the step size
+        lr = self.learning_rate * np.sqrt(1 - self.beta2 ** self.t) / (1 - self.beta1 ** self.t)
+
+        for p, g, m, v in zip(params, grads, self.means, self.variances):
+            # m = beta1 * m + (1 - beta1) * g, written as beta1 * (m - g) + g to need no scratch array
+            np.subtract(m, g, out=m)
+            m *= self.beta1
+            m += g
+            # the same for v with g**2; from here on g holds g**2 and then the step
+            np.multiply(g, g, out=g)
+            np.subtract(v, g, out=v)
+            v *= self.beta2
+            v += g
+            np.sqrt(v, out=g)
+            g += self.eps
+            np.divide(m, g, out=g)
+            g *= lr
+            np.subtract(p, g, out=p)
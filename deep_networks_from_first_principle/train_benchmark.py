@@ -0,0 +1,48 @@
+import sys
+import time
+import numpy as np
+from backprop import model
+
+def reference_epoch(m, data, y_true, learning_rate):
+    """
+    The previous training loop, with its breakpoint removed and its update fixed to an outer product:
+    one sample per step, sigmoid via np.vectorize, new arrays for every intermediate result.
+    """
+    sig = np.vectorize(lambda x: 1 / ( 1 + np.exp(-x)))
+    for x, y in zip(data, y_true):
+        inputs = [x[np.newaxis, :]]
+        for l in m.layers:
+            inputs.append(sig(np.matmul(inputs[-1], l.weights) + l.biases))
+        err = y - inputs[-1]
+        for l, inp, out in zip(m.layers[::-1], inputs[-2::-1], inputs[:0:-1]):
+            deltas = err * out * (1.0 - out)
+            err = np.matmul(deltas, l.weights.T)
+            l.weights = l.weights + learning_rate * np.outer(inp, deltas)
+            l.biases = l.biases + learning_rate * deltas
+
+def make_data(n, n_features=20, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, n_features))
+    y = (X[:, :2].sum(axis=1, keepdims=True) > 0).astype(float)
+    return X, y
+
+if __name__ == '__main__':
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    layers = [20, 64, 64, 1]
+    X, y = make_data(n)
+
+    print(f'network {layers}, {n} samples; one epoch each')
+    print(f'{"loop":>22} {"samples/sec":>12}')
+
+    n_ref = min(n, 2000) # the reference loop is only run on a part of the samples
+    m = model(layers=layers)
+    start = time.perf_counter()
+    reference_epoch(m, X[:n_ref], y[:n_ref], learning_rate=.1)
+    print(f'{"reference, 1 sample":>22} {n_ref / (time.perf_counter() - start):>12.0f}')
+
+    for batch_size in (1, 32, 256):
+        m = model(layers=layers)
+        start = time.perf_counter()
+        m.train(X, y, epochs=1, learning_rate=.1, batch_size=batch_size, verbose=False)
+        print(f'{f"batched, {batch_size} samples":>22} {n / (time.perf_counter() - start):>12.0f}')
@@ -0,0 +1,196 @@
+from board import board
+from UnsolvableError import UnsolvableBoardError
+
+def _bits(mask):
+    # yields the single set bits of `mask`, lowest first
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+class BitmaskSolver():
+    """
+    Solves a `board` by constraint propagation and search, with the API of `Solver`.
+
+    Every row, column and box keeps a bitmask of the values it already contains
+    (bit v - minval for value v), thus the candidates of a cell are three ORs away and
+    an assignment updates three integers. Before each guess, naked singles (cells
+    with one candidate) and hidden singles (values with one possible cell in a row,
+    column or box) are filled in; then the empty cell with the fewest candidates is
+    guessed on (MRV). Assignments are recorded on a trail and undone from there.
+
+    Step counts:
+    forward_steps: number of values assigned, guessed or propagated
+    backward_steps: number of guesses that were taken back
+    """
+
+    def __init__(self, board):
+        self.board = board
+        n = board.h
+        q = board.quaterLen
+        self.n = n
+        self.full = (1 << n) - 1
+
+        self.row_of = [i // n for i in range(n * n)]
+        self.col_of = [i % n for i in range(n * n)]
+        self.box_of = [(i // n // q) * q + (i % n) // q for i in range(n * n)]
+        self.units = [(0, u, [i for i in range(n * n) if self.row_of[i] == u]) for u in range(n)]
+        self.units += [(1, u, [i for i in range(n * n) if self.col_of[i] == u]) for u in range(n)]
+        self.units += [(2, u, [i for i in range(n * n) if self.box_of[i] == u]) for u in range(n)]
+
+        self.used = [[0] * n, [0] * n, [0] * n] # rows, cols, boxes
+        self.cells = [0] * (n * n) # bit of the value of each cell; 0 if empty
+        self.empty = set()
+        self.trail = []
+        self.forward_steps = 0
+        self.backward_steps = 0
+
+        for i, val in enumerate(board.board.ravel().tolist()):
+            if val == board.empty_symbol:
+                self.empty.add(i)
+            elif self._candidates(i) >> (val - board.minval) & 1:
+                self._place(i, 1 << (val - board.minval))
+            else:
+                raise UnsolvableBoardError(f'Value {val} at {(self.row_of[i], self.col_of[i])} violates the rules.')
+        self.trail = []
+
+    def _candidates(self, i):
+        return self.full & ~(self.used[0][self.row_of[i]] | self.used[1][self.col_of[i]] | self.used[2][self.box_of[i]])
+
+    def _place(self, i, bit):
+        self.used[0][self.row_of[i]] |= bit
+        self.used[1][self.col_of[i]] |= bit
+        self.used[2][self.box_of[i]] |= bit
+        self.cells[i] = bit
+        self.empty.discard(i)
+        self.trail.append(i)
+        self.forward_steps += 1
+
+    def _undo(self, mark):
+        # takes back all assignments after trail position `mark`
+        while len(self.trail) > mark:
+            i = self.trail.pop()
+            bit = self.cells[i]
+            self.used[0][self.row_of[i]] ^= bit
+            self.used[1][self.col_of[i]] ^= bit
+            self.used[2][self.box_of[i]] ^= bit
+            self.cells[i] = 0
+            self.empty.add(i)
+
+    def _propagate(self):
+        """
+        Fills in naked and hidden singles until none are left.
+        Returns False if a cell has no candidate or a value has no cell left in some unit.
+        """
+        changed = True
+        while changed:
+            changed = False
+            for i in list(self.empty):
+                cands = self._candidates(i)
+                if cands == 0:
+                    return False
+                if cands & (cands - 1) == 0:
+                    self._place(i, cands)
+                    changed = True
+
+            for kind, u, unit in self.units:
+                once = twice = 0
+                for i in unit:
+                    if self.cells[i] == 0:
+                        cands = self._candidates(i)
+                        twice |= once & cands
+                        once |= cands
+                if self.full & ~(once | self.used[kind][u]):
+                    return False # a value that is missing in the unit fits nowhere
+                hidden = once & ~twice
+                for bit in _bits(hidden):
+                    for i in unit:
+                        if self.cells[i] == 0 and self._candidates(i) & bit:
+                            self._place(i, bit)
+                            changed = True
+                            break
+        return True
+
+    def _search(self):
+        mark = len(self.trail)
+        if not self._propagate():
+            self._undo(mark)
+            return False
+        if not self.empty:
+            return True
+
+        # most constrained cell first
+        i = min(self.empty, key=lambda i: bin(self._candidates(i)).count('1'))
+        for bit in _bits(self._candidates(i)):
+            guess = len(self.trail)
+            self._place(i, bit)
+            if self._search():
+                return True
+            self._undo(guess)
+            self.backward_steps += 1
+
+        self._undo(mark)
+        return False
+
+    def _count(self, limit):
+        # like `_search`, but goes on after a solution; always undoes its assignments
+        mark = len(self.trail)
+        if not self._propagate():
+            self._undo(mark)
+            return 0
+        if not self.empty:
+            self._undo(mark)
+            return 1
+
+        found = 0
+        i = min(self.empty, key=lambda i: bin(self._candidates(i)).count('1'))
+        for bit in _bits(self._candidates(i)):
+            guess = len(self.trail)
+            self._place(i, bit)
+            found += self._count(limit - found)
+            self._undo(guess)
+            self.backward_steps += 1
+            if found >= limit:
+                break
+
+        self._undo(mark)
+        return found
+
+    def count_solutions(self, limit=2):
+        """
+        Counts the solutions of the board, but stops as soon as `limit` solutions are found.
+        Works on the bitmasks and the trail only; the board is not modified.
+
+        Return:
+        int \in [0|limit]
+        """
+        self.forward_steps = 0
+        self.backward_steps = 0
+        return self._count(limit)
+
+    def is_unique(self):
+        """
+        True if the board has exactly one solution.
+        """
+        return self.count_solutions(limit=2) == 1
+
+    def fit(self, verbose=True):
+        self.forward_steps = 0
+        self.backward_steps = 0
+        if not self._search():
+            raise UnsolvableBoardError('Could not determine a solution for the board.')
+
+        n = self.n
+        for i, bit in enumerate(self.cells):
+            self.board.board[i // n, i % n] = bit.bit_length() - 1 + self.board.minval
+        self._undo(0) # back to the givens, e.g. for a later `count_solutions`
+        if verbose:
+            print(f'Needed {self.forward_steps} forward and {self.backward_steps} backward steps.')
+
+if __name__ == '__main__':
+
+    b = board.from_string('8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..')
+    print(b)
+    S = BitmaskSolver(b)
+    S.fit()
+    print(b)
@@ -0,0 +1,182 @@
+import numpy as np
+from UnsolvableError import UnsolvableBoardError
+
+class DLXSolver():
+    """
+    Solves a `board` of any size n*n (n = quaterLen**2) as exact cover problem,
+    with Knuth's Algorithm X on Dancing Links; same API as `Solver`.
+
+    Each candidate (row, col, val) of an empty cell is a row of the exact cover matrix,
+    covering four constraints: the cell is filled, and val appears in the row, in the
+    column and in the box. Only candidates that agree with the givens and constraints
+    the givens leave open are built. The sparse matrix is kept as circular doubly linked
+    lists in flat Python lists (left, right, up, down, column of each node), thus
+    covering and uncovering a column only relinks nodes, and the search is iterative.
+    The column with the fewest remaining rows is covered first.
+
+    Step counts:
+    forward_steps: number of candidates selected
+    backward_steps: number of candidates taken back
+    """
+
+    def __init__(self, board):
+        self.board = board
+        n = board.h
+        q = board.quaterLen
+        grid = board.board
+        assert q * q == n, f'Board of size {n} has no square boxes.'
+
+        def box(r, c):
+            return (r // q) * q + c // q
+
+        # values already placed in each row, column and box
+        rows, cols, boxes = [set() for _ in range(n)], [set() for _ in range(n)], [set() for _ in range(n)]
+        for r, c in zip(*np.nonzero(grid != board.empty_symbol)):
+            r, c, val = int(r), int(c), int(grid[r, c])
+            if val in rows[r] or val in cols[c] or val in boxes[box(r, c)]:
+                raise UnsolvableBoardError(f'Value {val} at {(r, c)} violates the rules.')
+            rows[r].add(val); cols[c].add(val); boxes[box(r, c)].add(val)
+
+        # candidates and the open constraints they cover
+        self.candidates = []
+        constraints = {}
+        covers = []
+        for r, c in zip(*np.nonzero(grid == board.empty_symbol)):
+            r, c = int(r), int(c)
+            for val in range(board.minval, board.maxval + 1):
+                if val in rows[r] or val in cols[c] or val in boxes[box(r, c)]:
+                    continue
+                keys = (('cell', r, c), ('row', r, val), ('col', c, val), ('box', box(r, c), val))
+                covers.append([constraints.setdefault(k, len(constraints) + 1) for k in keys])
+                self.candidates.append((r, c, val))
+
+        # a constraint no candidate covers (e.g. an empty cell without candidates) makes the board unsolvable
+        self.n_open = (n * n - np.count_nonzero(grid != board.empty_symbol)) * 4
+        self._link(len(constraints), covers)
+
+    def _link(self, n_cols, covers):
+        # node 0 is the root, nodes 1..n_cols the column headers
+        self.L = [i - 1 for i in range(n_cols + 1)]
+        self.R = [i + 1 for i in range(n_cols + 1)]
+        self.L[0], self.R[n_cols] = n_cols, 0
+        self.U = list(range(n_cols + 1))
+        self.D = list(range(n_cols + 1))
+        self.C = list(range(n_cols + 1))
+        self.row = [-1] * (n_cols + 1) # candidate of each node
+        self.S = [0] * (n_cols + 1) # remaining rows per column
+
+        for cand, cs in enumerate(covers):
+            first = len(self.C)
+            for k, c in enumerate(cs):
+                i = len(self.C)
+                self.C.append(c)
+                self.row.append(cand)
+                # below the last node of column c
+                self.U.append(self.U[c])
+                self.D.append(c)
+                self.D[self.U[c]] = i
+                self.U[c] = i
+                self.S[c] += 1
+                # right of the previous node of this candidate
+                self.L.append(i - 1 if k else i)
+                self.R.append(first)
+                if k:
+                    self.R[i - 1] = i
+                    self.L[first] = i
+
+    def _cover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    def _choose(self):
+        # open column with the fewest rows
+        best, size = None, None
+        c = self.R[0]
+        while c != 0:
+            if size is None or self.S[c] < size:
+                best, size = c, self.S[c]
+                if size <= 1:
+                    break
+            c = self.R[c]
+        return best
+
+    def _search(self):
+        """
+        Iterative Algorithm X; returns the selected row nodes, or None if there is no exact cover.
+        """
+        if len(self.S) - 1 < self.n_open:
+            return None
+        R, D, L, C = self.R, self.D, self.L, self.C
+        selected = []
+        while R[0] != 0:
+            c = self._choose()
+            self._cover(c)
+            r = D[c]
+            while r == c:
+                # all rows of column c failed: go back to the previous choice and try its next row
+                self._uncover(c)
+                if not selected:
+                    return None
+                r = selected.pop()
+                self.backward_steps += 1
+                j = L[r]
+                while j != r:
+                    self._uncover(C[j])
+                    j = L[j]
+                c = C[r]
+                r = D[r]
+
+            selected.append(r)
+            self.forward_steps += 1
+            j = R[r]
+            while j != r:
+                self._cover(C[j])
+                j = R[j]
+        return selected
+
+    def fit(self, verbose=True):
+        self.forward_steps = 0
+        self.backward_steps = 0
+        selected = self._search()
+        if selected is None:
+            raise UnsolvableBoardError('Could not determine a solution for the board.')
+
+        for node in selected:
+            r, c, val = self.candidates[self.row[node]]
+            self.board.board[r, c] = val
+        if verbose:
+            print(f'Needed {self.forward_steps} forward and {self.backward_steps} backward steps.')
+
+if __name__ == '__main__':
+
+    from solver_benchmark import pattern_board
+
+    b = pattern_board(4, 0.55, seed=0)
+    print(b)
+    S = DLXSolver(b)
+    S.fit()
+    print(b)
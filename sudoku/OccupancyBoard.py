@@ -0,0 +1,54 @@
+from board import board
+
+class OccupancyBoard(board):
+    """
+    `board` that keeps, per row, column and box, how often each value occurs.
+
+    The counters are updated by `set_value` and `reset_value`, thus `checker` is three
+    list lookups instead of slicing the array and scanning row, column and box; it
+    allocates nothing. Can be passed to `Solver` like a `board`.
+
+    Remarks:
+    - Cells need to be written through `set_value` and `reset_value`, otherwise the
+      counters no longer match `self.board`.
+    """
+
+    def __init__(self, np2darr):
+        super().__init__(np2darr)
+
+        n, q = self.h, self.quaterLen
+        self._box_of = [[(r // q) * q + c // q for c in range(n)] for r in range(n)]
+        # counters are indexed by value; index 0 (empty) is never checked
+        self._rows = [[0] * (self.maxval + 1) for _ in range(n)]
+        self._cols = [[0] * (self.maxval + 1) for _ in range(n)]
+        self._boxes = [[0] * (self.maxval + 1) for _ in range(n)]
+        for r, row in enumerate(self.board.tolist()):
+            for c, val in enumerate(row):
+                if val != self.empty_symbol:
+                    self._count(r, c, val, 1)
+
+    def _count(self, r, c, val, delta):
+        self._rows[r][val] += delta
+        self._cols[c][val] += delta
+        self._boxes[self._box_of[r][c]][val] += delta
+
+    def checker(self, coords, val):
+        r, c = coords
+        return not (self._rows[r][val] or self._cols[c][val] or self._boxes[self._box_of[r][c]][val])
+
+    def set_value(self, coords, val):
+        assert self.checker(coords=coords, val=val), f'Can not set {val} at {coords}.'
+        r, c = coords
+        old = self.board[r, c]
+        if old != self.empty_symbol:
+            self._count(r, c, old, -1)
+        self._count(r, c, val, 1)
+        self.board[r, c] = val
+        return True
+
+    def reset_value(self, coords):
+        r, c = coords
+        old = self.board[r, c]
+        if old != self.empty_symbol:
+            self._count(r, c, old, -1)
+            self.board[r, c] = self.empty_symbol
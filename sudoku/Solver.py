@@ -18,7 +18,7 @@ class _SingleSolver():
         return False
 
     def _resetVal(self, board):
-        board.board[(self.coords)] = board.empty_symbol
+        board.reset_value(coords=self.coords)
 
     def _resetAll(self, board):
         self._resetVal(board=board)
@@ -35,7 +35,7 @@ class Solver():
         self.unsolved = self._get_unsolved()
         self.ptr = 0
 
-    def fit(self):
+    def fit(self, verbose=True):
         forward_steps = 0
         backward_steps = 0
         while self.ptr != len(self.unsolved):
@@ -50,7 +50,55 @@ class Solver():
 
 
             if self.ptr < 0:
+                self.forward_steps = forward_steps
+                self.backward_steps = backward_steps
                 raise UnsolvableBoardError('Could not determine a solution for the board.')
 
-        print(f'Needed {forward_steps} forward and {backward_steps} backward steps.')
+        self.forward_steps = forward_steps
+        self.backward_steps = backward_steps
+        if verbose:
+            print(f'Needed {forward_steps} forward and {backward_steps} backward steps.')
 
+    def _restore(self):
+        # empties all cells that were unsolved, thus the board is the puzzle again
+        for single in self.unsolved:
+            single._resetVal(self.board)
+            if hasattr(single, 'gen'):
+                del single.gen
+        self.ptr = 0
+
+    def count_solutions(self, limit=2):
+        """
+        Counts the solutions of the board, but stops as soon as `limit` solutions are found.
+
+        The backtracking of `fit` continues past each solution by trying the next value
+        of the last cell; it works on the board in place, which holds the puzzle again afterwards.
+
+        Return:
+        int \in [0|limit]
+        """
+        count = 0
+        while self.ptr >= 0:
+            if self.ptr == len(self.unsolved):
+                count += 1
+                if count >= limit:
+                    break
+                self.ptr -= 1
+                if self.ptr >= 0:
+                    self.unsolved[self.ptr]._resetVal(self.board)
+            elif self.unsolved[self.ptr]._solve(self.board):
+                self.ptr += 1
+            else:
+                self.unsolved[self.ptr]._resetAll(self.board)
+                self.ptr -= 1
+                if self.ptr >= 0:
+                    self.unsolved[self.ptr]._resetVal(self.board)
+
+        self._restore()
+        return count
+
+    def is_unique(self):
+        """
+        True if the board has exactly one solution.
+        """
+        return self.count_solutions(limit=2) == 1
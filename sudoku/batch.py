@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+import numpy as np
+from board import board
+from Solver import Solver
+from BitmaskSolver import BitmaskSolver
+from DLXSolver import DLXSolver
+from UnsolvableError import UnsolvableBoardError
+
+ENGINES = {'backtrack': Solver, 'bitmask': BitmaskSolver, 'dlx': DLXSolver}
+
+def read_puzzles(path):
+    """
+    Yields the puzzles of a file one at a time, without loading the whole file.
+
+    Text files hold one puzzle per line (see `board.from_string`); empty lines and lines
+    starting with '#' are skipped. NumPy files (.npy) hold an array of shape (m, n*n) or
+    (m, n, n), which is memory-mapped.
+    """
+    if path.endswith('.npy'):
+        arr = np.load(path, mmap_mode='r')
+        if len(arr) == 0:
+            return
+        n = int(np.sqrt(arr[0].size))
+        for puzzle in arr:
+            yield np.array(puzzle).reshape(n, n)
+        return
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+def solve_one(puzzle, engine='bitmask'):
+    """
+    Solves a puzzle, given as line or as 2d array.
+
+    Return:
+    (status, solution, forward_steps, backward_steps, seconds)
+    status: str
+        'solved', 'unsolvable', or 'invalid' if the puzzle is no square board or has symbols out of range
+    solution: str or None
+        solved board as line, see `board.to_string`
+    """
+    start = time.perf_counter()
+    S = None
+    try:
+        b = board.from_string(puzzle) if isinstance(puzzle, str) else board(puzzle.copy())
+        if not b.is_valid():
+            raise UnsolvableBoardError('The givens violate the rules.') # not every engine checks them itself
+        S = ENGINES[engine](b)
+        S.fit(verbose=False)
+    except UnsolvableBoardError:
+        steps = (S.forward_steps, S.backward_steps) if S is not None else (0, 0) # rules violated by the givens
+        return ('unsolvable', None) + steps + (time.perf_counter() - start,)
+    except (AssertionError, ValueError):
+        return 'invalid', None, 0, 0, time.perf_counter() - start
+    return 'solved', b.to_string(), S.forward_steps, S.backward_steps, time.perf_counter() - start
+
+def _solve_chunk(first, puzzles, engine):
+    return [(first + k,) + solve_one(p, engine) for k, p in enumerate(puzzles)]
+
+def solve_batch(puzzles, out, engine='bitmask', n_jobs=None, chunksize=64, verbose=True):
+    """
+    Solves a stream of puzzles on a process pool and writes one result per line to `out`
+    as soon as it is known, i.e. not in input order:
+        index, status, solution ('-' if none), forward steps, backward steps, seconds (tab separated)
+
+    Puzzles are sent to the workers in chunks of `chunksize`; at most a few chunks per
+    worker are in flight, thus the stream is never read into memory as a whole.
+    Unsolvable and invalid puzzles are reported with their status and do not stop the run.
+
+    Input:
+    puzzles: iterable
+        puzzles as lines or 2d arrays, e.g. `read_puzzles(path)`
+    out: file
+        opened for writing
+    n_jobs: int or None
+        number of worker processes; None for all CPU cores
+
+    Return:
+    dict with the number of puzzles per status, the total number, seconds and puzzles per second
+    """
+    assert engine in ENGINES, f'engine needs to be one of {list(ENGINES)}, but is {engine}'
+    workers = n_jobs or os.cpu_count()
+    puzzles = iter(puzzles)
+    counts = {'solved': 0, 'unsolvable': 0, 'invalid': 0}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        first = 0
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < 2 * workers:
+                chunk = list(islice(puzzles, chunksize))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_solve_chunk, first, chunk, engine))
+                first += len(chunk)
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for index, status, solution, forward, backward, seconds in future.result():
+                    counts[status] += 1
+                    out.write(f'{index}\t{status}\t{solution or "-"}\t{forward}\t{backward}\t{seconds:.6f}\n')
+            out.flush()
+
+    seconds = time.perf_counter() - start
+    total = sum(counts.values())
+    summary = dict(counts, total=total, seconds=seconds, per_sec=total / seconds if seconds else 0.0)
+    if verbose:
+        print(f'{total} puzzles in {seconds:.2f}s ({summary["per_sec"]:.1f} puzzles/sec): '
+              f'{counts["solved"]} solved, {counts["unsolvable"]} unsolvable, {counts["invalid"]} invalid.')
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solves all puzzles of a file in parallel.')
+    parser.add_argument('puzzles', help='text file with one puzzle per line, or .npy file')
+    parser.add_argument('out', help='results, one tab separated line per puzzle; - for stdout')
+    parser.add_argument('--engine', default='bitmask', choices=list(ENGINES))
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes; all CPU cores by default')
+    parser.add_argument('--chunksize', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w')
+    try:
+        return solve_batch(read_puzzles(args.puzzles), out, engine=args.engine, n_jobs=args.jobs, chunksize=args.chunksize, verbose=out is not sys.stdout)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == '__main__':
+    main()
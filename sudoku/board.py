@@ -13,21 +13,44 @@ class board():
         self.minval = 1
         self.maxval = self.h
 
+    @classmethod
+    def from_string(cls, line):
+        """
+        Board from a single line of h*h symbols in row-major order, e.g. 81 characters for 9x9.
+        Digits are values; '0' and '.' are empty cells.
+        Values above 9 need h > 9 and are written as letters, 'A' being 10.
+        """
+        line = line.strip()
+        h = int(np.sqrt(len(line)))
+        assert h * h == len(line), f'Line of {len(line)} symbols is no square board.'
+        vals = [0 if ch == '.' else int(ch, 36) for ch in line]
+        assert max(vals) <= h, f'Symbol {line[vals.index(max(vals))]} is out of range for a board of size {h}.'
+        return cls(np.array(vals).reshape(h, h))
+
+    def to_string(self):
+        """
+        Inverse of `from_string`, with '.' for empty cells.
+        """
+        digits = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+        return ''.join('.' if v == self.empty_symbol else digits[v] for v in self.board.ravel())
+
     def __str__(self):
 
+        width = len(str(self.maxval))
+        dashes = '-' * (self.h * (width + 1) + self.quaterLen + 1)
         s = ''
         for r, row in enumerate(self.board):
 
-            if r%3==0:
-                s += '-' * (10 * 2 + 2)
+            if r%self.quaterLen==0:
+                s += dashes
                 s += '\n'
             for c, col in enumerate(row):
-                if c % 3==0:
+                if c % self.quaterLen==0:
                     s += '|'
                 if col == 0:
-                    s += '  '
+                    s += ' ' * (width + 1)
                 else:
-                    s += str(col) + ' '
+                    s += str(col).rjust(width) + ' '
             else:
                 s += '|'
 
@@ -35,11 +58,23 @@ class board():
 
         # dash on last line
         else:
-            s += '-' * (10 * 2 + 2)
+            s += dashes
             s += '\n'
 
         return s
 
+    def is_valid(self):
+        """
+        True if all values are within [minval, maxval] and no value appears twice in a row, column or box.
+        """
+        filled = self.board != self.empty_symbol
+        vals = self.board[filled]
+        if ((vals < self.minval) | (vals > self.maxval)).any():
+            return False
+        r, c = np.nonzero(filled)
+        boxes = (r // self.quaterLen) * self.quaterLen + c // self.quaterLen
+        return all(len(set(zip(unit, vals))) == len(vals) for unit in (r, c, boxes))
+
     def _getQuater(self, coords):
         x = (coords[1] // self.quaterLen) * self.quaterLen
         y = (coords[0] // self.quaterLen) * self.quaterLen
@@ -61,3 +96,6 @@ class board():
         self.board[coords] = val
         return True
 
+    def reset_value(self, coords):
+        self.board[coords] = self.empty_symbol
+
@@ -0,0 +1,33 @@
+import sys
+import time
+import numpy as np
+from board import board
+from OccupancyBoard import OccupancyBoard
+from Solver import Solver
+from solver_benchmark import PUZZLES
+
+def checks_per_sec(b, probes):
+    start = time.perf_counter()
+    for coords, val in probes:
+        b.checker(coords=coords, val=val)
+    return len(probes) / (time.perf_counter() - start)
+
+if __name__ == '__main__':
+
+    n_probes = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = np.random.default_rng(0)
+    line = PUZZLES[1]
+
+    # probes as the Solver makes them: coordinates from np.where, values as int
+    empty = list(zip(*np.where(board.from_string(line).board == 0)))
+    probes = [(empty[i], int(v)) for i, v in zip(rng.integers(0, len(empty), n_probes), rng.integers(1, 10, n_probes))]
+
+    print(f'{"backend":>15} {"checks/sec":>12} {"Solver.fit[s]":>14} {"steps":>8}')
+    for backend in (board, OccupancyBoard):
+        rate = checks_per_sec(backend.from_string(line), probes)
+        b = backend.from_string(line)
+        S = Solver(b)
+        start = time.perf_counter()
+        S.fit(verbose=False)
+        seconds = time.perf_counter() - start
+        print(f'{backend.__name__:>15} {rate:>12.0f} {seconds:>14.3f} {S.forward_steps:>8}')
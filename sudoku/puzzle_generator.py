@@ -0,0 +1,52 @@
+import sys
+import time
+import numpy as np
+from Solver import Solver
+from BitmaskSolver import BitmaskSolver
+from solver_benchmark import pattern_board
+
+def generate(q=3, seed=None, engine=BitmaskSolver):
+    """
+    Generates a puzzle with a unique solution and boxes of q*q cells.
+
+    Starts from a random solved board and removes clues in random order; a clue is
+    put back if the board is no longer unique. Thus no clue of the result can be removed.
+
+    Return:
+    (puzzle, checks)
+    puzzle: board
+    checks: int
+        number of uniqueness checks, i.e. `count_solutions(limit=2)` calls
+    """
+    rng = np.random.default_rng(seed)
+    b = pattern_board(q, 1.0, seed=rng.integers(2**32))
+    checks = 0
+    for i in rng.permutation(b.h * b.w):
+        coords = (i // b.w, i % b.w)
+        val = b.board[coords]
+        b.board[coords] = b.empty_symbol
+        checks += 1
+        if not engine(b).is_unique():
+            b.board[coords] = val
+    return b, checks
+
+if __name__ == '__main__':
+
+    n_puzzles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f'{"puzzle":>7} {"clues":>6} {"checks":>7} {"time[s]":>8} {"checks/sec":>11}')
+    total, total_checks = 0.0, 0
+    for p in range(n_puzzles):
+        start = time.perf_counter()
+        b, checks = generate(seed=p)
+        seconds = time.perf_counter() - start
+        total, total_checks = total + seconds, total_checks + checks
+        print(f'{p:>7} {np.count_nonzero(b.board):>6} {checks:>7} {seconds:>8.3f} {checks / seconds:>11.0f}')
+    print(f'{n_puzzles / total:.2f} puzzles/sec, {total_checks / total:.0f} uniqueness checks/sec')
+    print(b)
+
+    # a single uniqueness check of the last puzzle, by both engines
+    for name, engine in (('backtrack', Solver), ('bitmask', BitmaskSolver)):
+        start = time.perf_counter()
+        unique = engine(b).is_unique()
+        print(f'{name:>10}: unique {unique}, {time.perf_counter() - start:.3f}s')
@@ -0,0 +1,104 @@
+import sys
+import time
+from multiprocessing import Pool, TimeoutError
+import numpy as np
+from board import board
+from Solver import Solver
+from BitmaskSolver import BitmaskSolver
+from DLXSolver import DLXSolver
+
+# hard 9x9 puzzles with a unique solution, one line each
+PUZZLES = [
+    '53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79',
+    '6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....',
+    '48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....',
+    '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+    '..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..',
+    '1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..',
+]
+
+def pattern_board(q, clues, seed=0):
+    """
+    Random board with boxes of q*q cells: a shuffled valid solution, of which a fraction `clues` of cells is kept.
+    The solution is not necessarily unique.
+    """
+    rng = np.random.default_rng(seed)
+    n = q * q
+    # rows and columns are shuffled within bands / stacks, bands and stacks among each other
+    rows = [b * q + r for b in rng.permutation(q) for r in rng.permutation(q)]
+    cols = [s * q + c for s in rng.permutation(q) for c in rng.permutation(q)]
+    vals = rng.permutation(n) + 1
+    solved = np.array([[vals[(q * (r % q) + r // q + c) % n] for c in cols] for r in rows])
+    solved[rng.random((n, n)) >= clues] = 0
+    return board(solved)
+
+def run(engine, puzzle):
+    b = board.from_string(puzzle) if isinstance(puzzle, str) else board(puzzle.board.copy())
+    S = engine(b)
+    start = time.perf_counter()
+    S.fit(verbose=False)
+    return S.forward_steps, S.backward_steps, time.perf_counter() - start, b.to_string()
+
+def run_timeout(engine, puzzle, timeout):
+    """
+    `run` in a separate process, which is killed after `timeout` seconds; then returns None.
+    """
+    pool = Pool(1)
+    try:
+        return pool.apply_async(run, (engine, puzzle)).get(timeout)
+    except TimeoutError:
+        return None
+    finally:
+        pool.terminate()
+
+if __name__ == '__main__':
+
+    engines = [('backtrack', Solver), ('bitmask', BitmaskSolver), ('dlx', DLXSolver)]
+    if 'fast' in sys.argv[1:]:
+        engines = engines[1:]
+
+    print(f'{"puzzle":>7} {"engine":>10} {"forward":>9} {"backward":>9} {"time[s]":>9}')
+    totals = {name: 0.0 for name, _ in engines}
+    for p, line in enumerate(PUZZLES):
+        solutions = set()
+        for name, engine in engines:
+            forward, backward, seconds, solution = run(engine, line)
+            solutions.add(solution)
+            totals[name] += seconds
+            print(f'{p:>7} {name:>10} {forward:>9} {backward:>9} {seconds:>9.3f}')
+        assert len(solutions) == 1, f'Engines disagree on puzzle {p}'
+    for name, seconds in totals.items():
+        print(f'{"total":>7} {name:>10} {"":>9} {"":>9} {seconds:>9.3f}')
+
+    # the backtracker is hopeless on larger boards; the others depend a lot on the board.
+    # Measured on seeds 1-20: 16x16 at 35% clues takes bitmask at most 0.1s, dlx a median of
+    # 0.01s but one board times out. 25x25 at 50% clues takes a median of 0.05-0.1s, but a
+    # quarter of the boards (seeds 4, 6, 7, 18, 19) run longer than 10s, some for minutes.
+    seeds, timeout = range(1, 21), 10.0
+    print()
+    print(f'{"size":>7} {"seed":>5} {"engine":>10} {"forward":>9} {"backward":>9} {"time[s]":>9}')
+    summary = []
+    for q, clues in ((4, 0.35), (5, 0.5)):
+        times = {name: [] for name, _ in engines[-2:]}
+        for seed in seeds:
+            b = pattern_board(q, clues, seed=seed)
+            for name, engine in engines[-2:]:
+                result = run_timeout(engine, b, timeout)
+                if result is None:
+                    times[name].append(np.inf)
+                    print(f'{q * q:>4}^2 {seed:>5} {name:>10} {"":>9} {"":>9} {"timeout":>9}')
+                    continue
+                forward, backward, seconds, _ = result
+                times[name].append(seconds)
+                print(f'{q * q:>4}^2 {seed:>5} {name:>10} {forward:>9} {backward:>9} {seconds:>9.3f}')
+        summary += [(q, clues, name, np.array(t)) for name, t in times.items()]
+
+    print()
+    print(f'{len(seeds)} boards per size, timeout {timeout:.0f}s')
+    print(f'{"size":>7} {"clues":>6} {"engine":>10} {"median[s]":>10} {"max[s]":>9} {"timeouts":>9}')
+    for q, clues, name, t in summary:
+        done = t[np.isfinite(t)]
+        median = np.median(t)
+        median = f'{median:.3f}' if np.isfinite(median) else 'timeout'
+        slowest = f'{done.max():.3f}' if len(done) else '-'
+        print(f'{q * q:>4}^2 {clues:>6.2f} {name:>10} {median:>10} {slowest:>9} {len(t) - len(done):>9}')
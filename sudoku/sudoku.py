@@ -1,9 +1,16 @@
+import sys
 import numpy as np
 from board import board
 from Solver import Solver
+import batch
 
 if __name__ == '__main__':
 
+    if len(sys.argv) > 1:
+        # batch mode, e.g. `python sudoku.py puzzles.txt solutions.tsv --engine dlx`
+        batch.main(sys.argv[1:])
+        sys.exit()
+
     np2darr = np.array([
         [5,3,0,0,7,0,0,0,0],
         [6,0,0,1,9,5,0,0,0],